@@ -0,0 +1,98 @@
+"""
+요청 프로파일 조회/다운로드 API
+Authorization: Bearer <PROFILE_TOKEN> 필요 (PROFILE_TOKEN이 없으면 사용 안 함)
+
+- GET /api/profiles: 저장된 프로파일 목록 + 누적 hot function 통계
+- GET /api/profiles?id=<프로파일 ID>: .prof 파일 다운로드 (python -m pstats, snakeviz 등으로 분석)
+- POST {"id": "<프로파일 ID>"}: 프로파일 하나의 hot function 통계
+- POST {"action": "reset"}: 누적 통계 초기화
+
+프로파일은 요청을 처리한 프로세스의 PROFILE_DIR과 메모리에 저장되므로 모든 핸들러가 한 프로세스에서 실행되는
+자체 서버(local_server.py) 전용 - Vercel에서는 함수마다 인스턴스가 따로 있어 조회할 수 없으므로 400 응답
+(Vercel에서는 X-Profile 헤더 요청의 응답 본문 'profile'을 사용)
+"""
+
+import sys
+import os
+from urllib.parse import parse_qs, urlsplit
+
+# utils 모듈 경로 추가
+sys.path.append(os.path.dirname(__file__))
+from utils.sheets_common import get_logger
+from utils.http_common import JSONRequestHandler, UnauthorizedError, bearer_token, tokens_match
+from utils.profiling import (
+    ON_VERCEL,
+    PROFILE_TOKEN,
+    hot_functions,
+    list_profiles,
+    profile_path,
+    profile_summary,
+    reset_profiles
+)
+
+logger = get_logger('profiles')
+
+
+class handler(JSONRequestHandler):
+    """Vercel Serverless Function Handler"""
+
+    logger = logger
+    allowed_methods = 'GET, POST, OPTIONS'
+
+    def do_GET(self):
+        """GET 요청 처리 - 목록/통계 조회 또는 .prof 파일 다운로드"""
+        profile_id = parse_qs(urlsplit(self.path).query).get('id', [''])[0]
+        if profile_id:
+            self._dispatch(lambda: self._download(profile_id))
+        else:
+            self._dispatch(self._overview)
+
+    def handle_post(self, request_data):
+        """POST 요청 처리 - 프로파일 하나의 통계 또는 누적 통계 초기화"""
+        self._authorize()
+
+        if request_data.get('action') == 'reset':
+            reset_profiles()
+            return {'status': 'success', 'message': '누적 통계를 초기화했습니다'}
+
+        profile_id = request_data.get('id')
+        if not profile_id:
+            raise ValueError("id 또는 action이 필요합니다")
+        return {'status': 'success', 'profile': profile_summary(profile_id, int(request_data.get('limit', 30)))}
+
+    def _authorize(self):
+        """PROFILE_TOKEN 인증 확인 (Vercel에서는 사용 불가)"""
+        if not tokens_match(bearer_token(self.headers.get('Authorization')), PROFILE_TOKEN):
+            raise UnauthorizedError("인증 토큰이 올바르지 않습니다")
+        if ON_VERCEL:
+            raise ValueError(
+                "프로파일 조회는 자체 서버(local_server.py)에서만 사용할 수 있습니다 "
+                "(Vercel에서는 X-Profile 헤더 요청의 응답 'profile'을 확인하세요)"
+            )
+
+    def _overview(self):
+        self._authorize()
+        return {
+            'status': 'success',
+            'profiles': list_profiles(),
+            'hot_functions': hot_functions()
+        }
+
+    def _download(self, profile_id):
+        """.prof 파일을 그대로 전송 (JSON 응답 대신 직접 전송하므로 None 반환)"""
+        self._authorize()
+
+        path = profile_path(profile_id)
+        if not os.path.exists(path):
+            raise ValueError(f"프로파일을 찾을 수 없습니다: {profile_id}")
+        with open(path, 'rb') as f:
+            body = f.read()
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/octet-stream')
+        self.send_header('Content-Disposition', f'attachment; filename="{profile_id}.prof"')
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        return None
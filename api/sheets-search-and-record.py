@@ -0,0 +1,95 @@
+"""
+Google Sheets 전화번호 검색 + 문의인입 기록 API
+채널톡에서 한 번의 요청으로 전화번호를 검색하고, 검색 결과(시트명, 처리날짜)를 채워 '문의인입' 시트에 기록
+(sheets-search-phone + sheets-add-inquiry를 하나의 API 클라이언트로 처리)
+
+요청:
+- phone_number (필수): 고객 전화번호
+- name, change_date, request: 문의인입 A, E, F열
+- mobile_number: 문의인입 B열 (없으면 phone_number)
+- sheet_name, action_date: 전화번호를 찾지 못했을 때 문의인입 C, D열에 쓸 값 (선택)
+
+응답:
+- search: sheets-search-phone과 같은 검색 결과
+- inquiry: 문의인입 기록 결과 (기록에 실패해도 검색 결과는 응답, status는 'partial')
+"""
+
+import sys
+import os
+
+# utils 모듈 경로 추가
+sys.path.append(os.path.dirname(__file__))
+from utils.sheets_common import get_sheets_service, normalize_phone, is_upstream_failure, get_logger
+from utils.http_common import JSONRequestHandler
+from utils.phone_search import search_phone, warm_up
+from utils.inquiry import append_inquiry
+
+logger = get_logger('sheets-search-and-record')
+
+
+class handler(JSONRequestHandler):
+    """Vercel Serverless Function Handler"""
+
+    logger = logger
+    allowed_methods = 'GET, POST, OPTIONS'
+    warm_up = staticmethod(warm_up)  # GET: Vercel Cron 캐시 준비
+
+    def handle_post(self, request_data):
+        """POST 요청 처리 - 전화번호 검색 후 문의인입 기록"""
+        # 필수 파라미터 확인
+        phone_number = request_data.get('phone_number')
+        if not phone_number:
+            raise ValueError("phone_number가 필요합니다")
+
+        normalized_phone = normalize_phone(phone_number)
+        logger.info('search_and_record_start', phone_number=phone_number)
+
+        # 검색과 기록에 같은 API 클라이언트 사용
+        sheets_service = get_sheets_service()
+
+        # 수도권 문서 → 못 찾으면 지방 문서 검색 (캐시된 전화번호 인덱스 사용)
+        result = search_phone(sheets_service, normalized_phone)
+
+        search = {
+            'found': result['found'],
+            'sheet_name': result.get('sheet_name', ''),
+            'row': result.get('row'),
+            'action_date': result.get('action_date', ''),  # 처리날짜 (C열)
+            'product_list': result.get('product_list', ''),  # 상품명,증상 (F열)
+            'phone_normalized': normalized_phone
+        }
+        logger.info('search_result', found=search['found'], sheet_name=search['sheet_name'], row=search['row'])
+
+        # 검색 결과로 시트명/기존일정을 채워 문의인입 기록
+        inquiry = {
+            'name': request_data.get('name', ''),
+            'mobile_number': request_data.get('mobile_number') or phone_number,
+            'sheet_name': search['sheet_name'] if search['found'] else request_data.get('sheet_name', ''),
+            'action_date': search['action_date'] if search['found'] else request_data.get('action_date', ''),
+            'change_date': request_data.get('change_date', ''),
+            'request': request_data.get('request', '')
+        }
+
+        try:
+            inquiry_row = append_inquiry(sheets_service, inquiry, logger)
+        except Exception as e:
+            # 기록 실패 (Google Sheets 장애) - 검색 결과는 그대로 응답
+            if not is_upstream_failure(e):
+                raise
+            logger.error('inquiry_failed', error_type=type(e).__name__, error=str(e),
+                         duration_ms=self.elapsed_ms())
+            return {
+                'status': 'partial',
+                'message': '검색은 완료했지만 문의인입 기록에 실패했습니다',
+                'search': search,
+                'inquiry': {'status': 'error', 'message': str(e), 'type': type(e).__name__}
+            }
+
+        logger.info('inquiry_written', row=inquiry_row, duration_ms=self.elapsed_ms())
+
+        return {
+            'status': 'success',
+            'message': '검색 및 문의인입 기록 완료',
+            'search': search,
+            'inquiry': {'status': 'success', 'row': inquiry_row, 'data': inquiry}
+        }
@@ -0,0 +1,68 @@
+"""
+고객명/전화번호 일부 검색 API
+고객명(E열) 일부 또는 전화번호(H열, I열) 뒷자리로 수도권/지방 문서를 검색해
+순위순 후보 목록을 반환 (메모리 역색인 사용)
+
+요청:
+- name: 고객명 (일부 가능, 예: "길동")
+- phone_digits: 전화번호 뒷자리 4자리 이상 (예: "0838")
+- limit: 최대 후보 수 (기본 20, 최대 100)
+"""
+
+import sys
+import os
+
+# utils 모듈 경로 추가
+sys.path.append(os.path.dirname(__file__))
+from utils.sheets_common import get_sheets_service
+from utils.http_common import JSONRequestHandler
+from utils.customer_index import (
+    search_customers,
+    phone_digits_key,
+    warm_up_search_indexes,
+    PHONE_SUFFIX_LENGTH,
+    logger
+)
+
+# 최대 후보 수
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 100
+
+
+class handler(JSONRequestHandler):
+    """Vercel Serverless Function Handler"""
+
+    logger = logger
+    allowed_methods = 'GET, POST, OPTIONS'
+    warm_up = staticmethod(warm_up_search_indexes)  # GET: Vercel Cron 캐시 준비
+
+    def handle_post(self, request_data):
+        """POST 요청 처리 - 고객명 또는 전화번호 뒷자리로 후보 검색"""
+        name = str(request_data.get('name') or '').strip()
+        phone_digits = str(request_data.get('phone_digits') or '').strip()
+
+        if not name and not phone_digits:
+            raise ValueError("name 또는 phone_digits가 필요합니다")
+        if name and phone_digits:
+            raise ValueError("name과 phone_digits 중 하나만 보내주세요")
+        if phone_digits and len(phone_digits_key(phone_digits)) < PHONE_SUFFIX_LENGTH:
+            raise ValueError(f"phone_digits는 숫자 {PHONE_SUFFIX_LENGTH}자리 이상이어야 합니다")
+
+        try:
+            limit = int(request_data.get('limit', DEFAULT_LIMIT))
+        except (TypeError, ValueError):
+            raise ValueError("limit은 숫자여야 합니다")
+        limit = min(max(limit, 1), MAX_LIMIT)
+
+        sheets_service = get_sheets_service()
+        candidates = search_customers(sheets_service, name=name, phone_digits=phone_digits, limit=limit)
+
+        logger.info('customer_search', by='name' if name else 'phone_digits',
+                    candidate_count=len(candidates), duration_ms=self.elapsed_ms())
+
+        return {
+            'status': 'success',
+            'found': len(candidates) > 0,
+            'count': len(candidates),
+            'candidates': candidates
+        }
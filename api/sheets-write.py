@@ -1,133 +1,243 @@
 """
 Google Sheets Write API
 채널톡에서 데이터를 받아 Google Sheets에 쓰는 Vercel Serverless Function
+
+쓰기 모드:
+- sync (기본): 요청마다 바로 append 후 응답
+- write_behind: 로컬 저널에 기록하고 바로 응답, 백그라운드에서 (문서, 시트)별로 모아 append
+  SHEETS_WRITE_MODE 환경 변수 또는 요청의 write_mode로 지정
+  WRITE_JOURNAL_PATH가 영구 저장소일 때만 사용 가능 (자체 서버 전용, Vercel의 /tmp는 사용 불가)
+
+저널 관리 요청 (sheet_id 불필요):
+- {"action": "flush"}: 대기 중인 행을 즉시 기록
+- {"action": "status"}: 저널 상태 조회
 """
 
-from http.server import BaseHTTPRequestHandler
-import json
+import sys
 import os
-from google.oauth2 import service_account
-from googleapiclient.discovery import build
+import threading
 from datetime import datetime
 
-# Google Sheets API 설정
-SCOPES = ['https://www.googleapis.com/auth/spreadsheets']
-
-
-class handler(BaseHTTPRequestHandler):
+# utils 모듈 경로 추가
+sys.path.append(os.path.dirname(__file__))
+from utils.sheets_common import (
+    get_sheets_service,
+    get_sheet_metadata,
+    peek_spreadsheet_metadata,
+    quote_sheet_name,
+    is_upstream_failure,
+    get_logger
+)
+from utils.http_common import JSONRequestHandler
+from utils.write_journal import WriteJournal, WriteBehindFlusher, JOURNAL_PATH, journal_is_persistent
+
+# 쓰기 모드 기본값 ('sync' 또는 'write_behind')
+WRITE_MODE = os.environ.get('SHEETS_WRITE_MODE', 'sync')
+WRITE_MODES = ('sync', 'write_behind')
+
+logger = get_logger('sheets-write')
+
+# 지연 쓰기 저널과 플러셔 (첫 사용 시 생성)
+_journal = None
+_flusher = None
+_journal_lock = threading.Lock()
+
+
+def build_row_values(data):
+    """
+    요청 data 딕셔너리를 시트 행 값 리스트로 변환
+    name, message, timestamp 순서 뒤에 나머지 필드를 덧붙임
+
+    Args:
+        data (dict): 요청 data
+
+    Returns:
+        list: 행 값 리스트
+    """
+    row_values = [
+        data.get('name', ''),
+        data.get('message', ''),
+        data.get('timestamp', datetime.now().isoformat())
+    ]
+
+    # 추가 필드가 있으면 포함
+    for key, value in data.items():
+        if key not in ['name', 'message', 'timestamp']:
+            row_values.append(str(value))
+
+    return row_values
+
+
+def get_write_journal():
+    """
+    지연 쓰기 저널과 백그라운드 플러셔 가져오기 (처음 호출 시 생성, 플러셔 시작)
+
+    Returns:
+        tuple: (WriteJournal, WriteBehindFlusher)
+    """
+    global _journal, _flusher
+    with _journal_lock:
+        if _journal is None:
+            _journal = WriteJournal()
+            _flusher = WriteBehindFlusher(_journal, get_sheets_service, logger=logger)
+        _flusher.start()
+    return _journal, _flusher
+
+
+def require_persistent_journal():
+    """지연 쓰기 저널이 영구 저장소에 있는지 확인 (아니면 ValueError)"""
+    if not journal_is_persistent():
+        raise ValueError(
+            "write_behind는 WRITE_JOURNAL_PATH를 영구 저장소 경로로 지정한 자체 서버에서만 사용할 수 있습니다"
+        )
+
+
+def check_sheet_for_write_behind(sheets_service, sheet_id, sheet_name):
+    """
+    지연 쓰기 전 시트 존재 확인
+    캐시된 메타데이터에 있으면 API를 호출하지 않고, 캐시로 확인할 수 없을 때만 조회
+    Sheets API 장애로 조회하지 못하면 확인 없이 저널에 기록 (없는 시트는 플러셔가 append할 때 dead로 표시)
+
+    Raises:
+        ValueError: 조회 결과 시트가 없는 경우
+    """
+    metadata = peek_spreadsheet_metadata(sheet_id)
+    if metadata is not None and sheet_name in metadata.sheets:
+        return
+
+    try:
+        get_sheet_metadata(sheets_service, sheet_id, sheet_name)
+    except ValueError:
+        raise
+    except Exception as e:
+        if not is_upstream_failure(e):
+            raise
+        logger.warning('write_behind_unchecked_sheet', sheet_name=sheet_name, error_type=type(e).__name__)
+
+
+def resume_write_journal():
+    """
+    서버 시작 시 이전 프로세스가 남긴 대기 행 기록 (플러셔 시작 후 즉시 플러시)
+
+    Returns:
+        int: 대기 중이던 행 수 (저널을 사용하지 않으면 0)
+    """
+    if not journal_is_persistent() or not os.path.exists(JOURNAL_PATH):
+        return 0
+
+    journal, flusher = get_write_journal()
+    pending = journal.pending_count()
+    if pending:
+        logger.info('journal_resumed', pending_rows=pending)
+        journal.reset_retry_delays()
+        flusher.notify()
+    return pending
+
+
+class handler(JSONRequestHandler):
     """Vercel Serverless Function Handler"""
 
-    def _set_headers(self, status_code=200):
-        """HTTP 응답 헤더 설정"""
-        self.send_response(status_code)
-        self.send_header('Content-Type', 'application/json; charset=utf-8')
-        self.send_header('Access-Control-Allow-Origin', '*')
-        self.send_header('Access-Control-Allow-Methods', 'POST, OPTIONS')
-        self.send_header('Access-Control-Allow-Headers', 'Content-Type')
-        self.end_headers()
-
-    def do_OPTIONS(self):
-        """CORS preflight 요청 처리"""
-        self._set_headers(200)
+    logger = logger
 
-    def do_POST(self):
+    def handle_post(self, request_data):
         """POST 요청 처리 - Google Sheets에 데이터 쓰기"""
-        try:
-            # 요청 데이터 읽기
-            content_length = int(self.headers.get('Content-Length', 0))
-            if content_length == 0:
-                raise ValueError("요청 본문이 비어있습니다")
-
-            body = self.rfile.read(content_length)
-            request_data = json.loads(body.decode('utf-8'))
-
-            # 필수 파라미터 확인
-            sheet_id = request_data.get('sheet_id')
-            sheet_name = request_data.get('sheet_name')
-            data = request_data.get('data')
-
-            if not sheet_id:
-                raise ValueError("sheet_id가 필요합니다")
-            if not sheet_name:
-                raise ValueError("sheet_name이 필요합니다")
-            if not data:
-                raise ValueError("data가 필요합니다")
-
-            # Service Account 인증
-            service_account_json = os.environ.get('GOOGLE_SERVICE_ACCOUNT_JSON')
-            if not service_account_json:
-                raise ValueError("환경 변수 GOOGLE_SERVICE_ACCOUNT_JSON이 설정되지 않았습니다")
-
-            service_account_info = json.loads(service_account_json)
-            credentials = service_account.Credentials.from_service_account_info(
-                service_account_info, scopes=SCOPES
-            )
-
-            # Google Sheets API 클라이언트 생성
-            sheets_service = build('sheets', 'v4', credentials=credentials)
-
-            # 데이터를 행으로 변환
-            # data는 딕셔너리 형태로 들어오므로 리스트로 변환
-            row_values = [
-                data.get('name', ''),
-                data.get('message', ''),
-                data.get('timestamp', datetime.now().isoformat())
-            ]
-
-            # 추가 필드가 있으면 포함
-            for key, value in data.items():
-                if key not in ['name', 'message', 'timestamp']:
-                    row_values.append(str(value))
-
-            values = [row_values]
-            body_data = {'values': values}
-
-            # 시트에 데이터 추가 (맨 마지막 행에 추가)
-            result = sheets_service.spreadsheets().values().append(
-                spreadsheetId=sheet_id,
-                range=f'{sheet_name}!A:Z',  # A부터 Z열까지 사용 가능
-                valueInputOption='USER_ENTERED',  # 사용자 입력 형식 (날짜, 숫자 자동 변환)
-                insertDataOption='INSERT_ROWS',
-                body=body_data
-            ).execute()
-
-            # 성공 응답
-            self._set_headers(200)
-            response = {
+        # 저널 관리 요청
+        action = request_data.get('action')
+        if action:
+            return self._handle_journal_action(action)
+
+        # 필수 파라미터 확인
+        sheet_id = request_data.get('sheet_id')
+        sheet_name = request_data.get('sheet_name')
+        data = request_data.get('data')
+
+        if not sheet_id:
+            raise ValueError("sheet_id가 필요합니다")
+        if not sheet_name:
+            raise ValueError("sheet_name이 필요합니다")
+        if not data:
+            raise ValueError("data가 필요합니다")
+
+        write_mode = request_data.get('write_mode', WRITE_MODE)
+        if write_mode not in WRITE_MODES:
+            raise ValueError(f"write_mode는 {', '.join(WRITE_MODES)} 중 하나여야 합니다")
+        if write_mode == 'write_behind':
+            require_persistent_journal()
+
+        # Google Sheets API 클라이언트 (인스턴스 내 재사용)
+        sheets_service = get_sheets_service()
+
+        # 시트 존재 확인 (메타데이터 캐시 사용, 없는 시트는 400 응답)
+        # 지연 쓰기는 Sheets API 장애 중에도 저널에 기록되도록 조회 실패 시 확인을 플러셔에 맡김
+        if write_mode == 'write_behind':
+            check_sheet_for_write_behind(sheets_service, sheet_id, sheet_name)
+        else:
+            get_sheet_metadata(sheets_service, sheet_id, sheet_name)
+
+        # 데이터를 행으로 변환
+        # data는 딕셔너리 형태로 들어오므로 리스트로 변환
+        row_values = build_row_values(data)
+
+        if write_mode == 'write_behind':
+            # 저널에 기록하고 바로 응답 (실제 추가는 백그라운드 플러셔가 수행)
+            journal, flusher = get_write_journal()
+            journal_id = journal.enqueue(sheet_id, sheet_name, row_values)
+            flusher.notify()
+
+            logger.info('write_queued', sheet_name=sheet_name, journal_id=journal_id,
+                        duration_ms=self.elapsed_ms())
+
+            return {
                 'status': 'success',
-                'message': '데이터가 성공적으로 저장되었습니다',
-                'updated_range': result.get('updates', {}).get('updatedRange', ''),
-                'updated_rows': result.get('updates', {}).get('updatedRows', 0),
-                'updated_cells': result.get('updates', {}).get('updatedCells', 0)
+                'message': '데이터가 저장 대기열에 기록되었습니다',
+                'queued': True,
+                'journal_id': journal_id
             }
-            self.wfile.write(json.dumps(response, ensure_ascii=False).encode('utf-8'))
-
-        except json.JSONDecodeError as e:
-            # JSON 파싱 오류
-            self._set_headers(400)
-            error_response = {
-                'status': 'error',
-                'message': 'JSON 파싱 오류',
-                'error': str(e)
-            }
-            self.wfile.write(json.dumps(error_response, ensure_ascii=False).encode('utf-8'))
-
-        except ValueError as e:
-            # 요청 파라미터 오류
-            self._set_headers(400)
-            error_response = {
-                'status': 'error',
-                'message': str(e)
-            }
-            self.wfile.write(json.dumps(error_response, ensure_ascii=False).encode('utf-8'))
-
-        except Exception as e:
-            # 기타 오류
-            self._set_headers(500)
-            error_response = {
-                'status': 'error',
-                'message': '서버 오류가 발생했습니다',
-                'error': str(e),
-                'type': type(e).__name__
+
+        values = [row_values]
+        body_data = {'values': values}
+
+        # 시트에 데이터 추가 (맨 마지막 행에 추가)
+        result = sheets_service.spreadsheets().values().append(
+            spreadsheetId=sheet_id,
+            range=f'{quote_sheet_name(sheet_name)}!A:Z',  # A부터 Z열까지 사용 가능
+            valueInputOption='USER_ENTERED',  # 사용자 입력 형식 (날짜, 숫자 자동 변환)
+            insertDataOption='INSERT_ROWS',
+            body=body_data
+        ).execute()
+
+        logger.info('write_done', sheet_name=sheet_name,
+                    updated_range=result.get('updates', {}).get('updatedRange', ''),
+                    duration_ms=self.elapsed_ms())
+
+        # 성공 응답
+        return {
+            'status': 'success',
+            'message': '데이터가 성공적으로 저장되었습니다',
+            'updated_range': result.get('updates', {}).get('updatedRange', ''),
+            'updated_rows': result.get('updates', {}).get('updatedRows', 0),
+            'updated_cells': result.get('updates', {}).get('updatedCells', 0)
+        }
+
+    def _handle_journal_action(self, action):
+        """저널 관리 요청 처리 - flush: 즉시 기록, status: 상태 조회"""
+        if action not in ('flush', 'status'):
+            raise ValueError("action은 flush, status 중 하나여야 합니다")
+        require_persistent_journal()
+
+        journal, _ = get_write_journal()
+
+        if action == 'flush':
+            summary = journal.flush(get_sheets_service())
+            logger.info('journal_flushed', duration_ms=self.elapsed_ms(), **summary)
+            return {
+                'status': 'success',
+                'message': f"{summary['flushed_rows']}개의 행을 기록했습니다",
+                **summary,
+                'journal': journal.status()
             }
-            self.wfile.write(json.dumps(error_response, ensure_ascii=False).encode('utf-8'))
+
+        return {
+            'status': 'success',
+            'journal': journal.status()
+        }
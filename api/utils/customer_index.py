@@ -0,0 +1,343 @@
+"""
+고객명/전화번호 일부 검색 인덱스
+- E열(고객명): 글자 단위 1-gram, 2-gram 역색인 (한글 이름 부분 검색)
+- H열, I열(전화번호): 숫자 끝 4자리 역색인 (뒷자리 검색)
+- 문서별로 C, E, F, H, I열을 한 번에 읽어 메모리에 생성 (같은 읽기로 전화번호 인덱스도 함께 생성)
+- 고객 행이 아닌 탭(문의인입)은 제외
+- 만료되면 기존 인덱스로 바로 응답하고 백그라운드에서 새로 생성 (stale-while-revalidate)
+- 보관된 시트(cold)는 Google에서 읽지 않고 로컬 보관 파일의 값 사용
+"""
+
+import os
+import re
+import threading
+import time
+from itertools import islice, zip_longest
+
+from .sheets_common import (
+    get_spreadsheet_metadata,
+    normalize_phone,
+    batch_get_column_values,
+    format_sheet_date,
+    get_with_revalidate,
+    get_logger
+)
+from .phone_search import (
+    SEARCH_DOCUMENTS,
+    index_phone_columns,
+    store_phone_index,
+    index_build_lock,
+    register_combined_index_builder,
+    warm_up
+)
+from .inquiry import INQUIRY_SHEET_NAME
+from .sheet_archive import split_sheet_properties
+
+# 인덱스에 필요한 열 (C-처리날짜, E-고객명, F-상품명/증상, H-휴대폰번호, I-전화번호)
+INDEX_COLUMNS = ['C', 'E', 'F', 'H', 'I']
+
+# 고객 행이 아닌 탭 (열 구조가 다름, 문의인입 E열은 변경날짜)
+NON_CUSTOMER_SHEETS = {INQUIRY_SHEET_NAME}
+
+# 헤더 행 수 (인덱스에서 제외)
+HEADER_ROWS = 1
+
+# 전화번호 뒷자리 검색 최소 자릿수 (역색인 키 길이)
+PHONE_SUFFIX_LENGTH = 4
+
+# 이름 검색 시 검색어 n-gram 중 이 비율 이상 일치해야 후보로 포함
+NAME_MIN_SCORE = 0.5
+
+# 고객 인덱스 유효 시간 (초)
+CUSTOMER_INDEX_TTL = int(os.environ.get('CUSTOMER_INDEX_TTL', 300))
+
+logger = get_logger('sheets-search-customer')
+
+_NON_DIGITS = re.compile(r'\D')
+
+
+def _name_key(name):
+    """이름 비교용 키 (공백 제거, 소문자)"""
+    return ''.join(str(name).split()).lower()
+
+
+def _name_grams(text):
+    """이름의 1-gram, 2-gram 목록"""
+    grams = set(text)
+    grams.update(text[i:i + 2] for i in range(len(text) - 1))
+    return grams
+
+
+def phone_digits_key(phone):
+    """전화번호 비교용 숫자열 (정규화 후 숫자만, 예: +82 10-5217-0838 → 01052170838)"""
+    return _NON_DIGITS.sub('', normalize_phone(phone))
+
+
+def _query_grams(text):
+    """검색어 n-gram 목록 (2글자 이상이면 2-gram, 1글자면 1-gram)"""
+    if len(text) < 2:
+        return [text] if text else []
+    return [text[i:i + 2] for i in range(len(text) - 1)]
+
+
+class CustomerIndex:
+    """
+    문서 하나의 고객명/전화번호 역색인
+
+    records: [(시트 이름, 행 번호, 이름 키, 고객명, 처리날짜, 상품명/증상, (전화번호 숫자, ...)), ...]
+    시트 순서/행 순서로 저장되어 record ID가 작을수록 먼저 등장한 행
+    """
+
+    def __init__(self, spreadsheet_id, records):
+        self.spreadsheet_id = spreadsheet_id
+        self.records = records
+        self.built_at = time.time()
+
+        self.name_postings = {}
+        self.suffix_postings = {}
+        for record_id, record in enumerate(records):
+            for gram in _name_grams(record[2]):
+                self.name_postings.setdefault(gram, []).append(record_id)
+            for digits in set(record[6]):
+                suffix = digits[-PHONE_SUFFIX_LENGTH:]
+                self.suffix_postings.setdefault(suffix, []).append(record_id)
+
+    @property
+    def age(self):
+        """인덱스 생성 후 경과 시간 (초)"""
+        return time.time() - self.built_at
+
+    def search_name(self, name):
+        """
+        고객명 부분 검색
+
+        Args:
+            name (str): 검색할 이름 (일부 가능)
+
+        Returns:
+            list: [(순위 키, record ID), ...] 순위 키가 작을수록 우선
+        """
+        key = _name_key(name)
+        grams = _query_grams(key)
+        if not grams:
+            return []
+
+        # 검색어 n-gram이 몇 개 일치하는지 집계
+        hits = {}
+        for gram in set(grams):
+            for record_id in self.name_postings.get(gram, ()):
+                hits[record_id] = hits.get(record_id, 0) + 1
+
+        gram_count = len(set(grams))
+        ranked = []
+        for record_id, hit_count in hits.items():
+            score = hit_count / gram_count
+            if score < NAME_MIN_SCORE:
+                continue
+            record_key = self.records[record_id][2]
+            if record_key == key:
+                match_rank = 0  # 정확히 일치
+            elif record_key.startswith(key):
+                match_rank = 1  # 앞부분 일치
+            elif key in record_key:
+                match_rank = 2  # 부분 일치
+            else:
+                match_rank = 3  # n-gram 일부만 일치
+            ranked.append(((match_rank, -score), record_id))
+
+        return ranked
+
+    def search_phone_digits(self, digits):
+        """
+        전화번호 뒷자리 검색
+
+        Args:
+            digits (str): 전화번호 끝자리 숫자 (PHONE_SUFFIX_LENGTH자리 이상)
+
+        Returns:
+            list: [(순위 키, record ID), ...] 순위 키가 작을수록 우선
+        """
+        if len(digits) < PHONE_SUFFIX_LENGTH:
+            return []
+
+        ranked = []
+        for record_id in self.suffix_postings.get(digits[-PHONE_SUFFIX_LENGTH:], ()):
+            phones = self.records[record_id][6]
+            if any(phone == digits for phone in phones):
+                ranked.append(((0, 0), record_id))  # 전체 번호 일치
+            elif any(phone.endswith(digits) for phone in phones):
+                ranked.append(((1, 0), record_id))  # 뒷자리 일치
+
+        return ranked
+
+
+# 문서별 고객 인덱스 캐시 {spreadsheet_id: CustomerIndex}
+_customer_indexes = {}
+_customer_index_lock = threading.Lock()
+
+
+def index_customer_columns(sheet_id, sheet_names, all_data):
+    """
+    이미 읽은 열 값으로 고객 인덱스 생성
+
+    Args:
+        sheet_id: 문서 ID
+        sheet_names (list): 인덱스에 포함할 시트 이름 (시트 순서)
+        all_data (dict): {시트이름: {열: [값, ...]}} (C, E, F, H, I열 포함)
+
+    Returns:
+        CustomerIndex: 고객 인덱스
+    """
+    records = []
+    for sheet_name in sheet_names:
+        rows = zip_longest(*(all_data[sheet_name].get(column, []) for column in INDEX_COLUMNS), fillvalue='')
+
+        # 행 번호는 1부터 시작, 헤더 행 제외
+        for row_number, (c_value, e_value, f_value, h_value, i_value) in enumerate(
+                islice(rows, HEADER_ROWS, None), start=HEADER_ROWS + 1):
+            name = str(e_value)
+            phones = tuple(
+                digits for digits in (phone_digits_key(h_value), phone_digits_key(i_value)) if digits
+            )
+            if not name and not phones:
+                continue
+
+            records.append((
+                sheet_name,
+                row_number,
+                _name_key(name),
+                name,
+                format_sheet_date(c_value),
+                str(f_value),
+                phones
+            ))
+
+    return CustomerIndex(sheet_id, records)
+
+
+def _rebuild_search_indexes(sheets_service, sheet_id):
+    """
+    전화번호 인덱스와 고객 인덱스를 hot 시트의 C, E, F, H, I열 한 번의 배치 읽기로 함께 새로 만들어 캐시에 저장
+    (두 인덱스를 따로 만들면 같은 열을 두 번 읽어 읽기 할당량이 두 배로 듦)
+    문서별 인덱스 생성 락(index_build_lock) 안에서 호출
+
+    Returns:
+        tuple: (PhoneIndex, CustomerIndex)
+    """
+    metadata = get_spreadsheet_metadata(sheets_service, sheet_id)
+    hot_sheets, cold_sheets, archive = split_sheet_properties(sheets_service, sheet_id, metadata)
+    hot_names = [props['title'] for props in hot_sheets]
+
+    all_data = batch_get_column_values(sheets_service, sheet_id, hot_names, INDEX_COLUMNS)
+
+    # 전화번호 인덱스는 hot 시트만, 고객 인덱스는 보관 파일의 값까지 포함 (고객 행이 아닌 탭 제외)
+    phone_index = index_phone_columns(sheet_id, hot_names, all_data)
+    for sheet_name in cold_sheets:
+        all_data[sheet_name] = archive.column_values(sheet_name)
+    customer_index = index_customer_columns(
+        sheet_id, [title for title in metadata.titles if title not in NON_CUSTOMER_SHEETS], all_data
+    )
+
+    store_phone_index(phone_index)
+    with _customer_index_lock:
+        _customer_indexes[sheet_id] = customer_index
+
+    logger.debug('search_indexes_built', spreadsheet=sheet_id[:10], sheet_count=len(metadata.titles),
+                 archived_sheet_count=len(cold_sheets), phone_count=len(phone_index.entries),
+                 record_count=len(customer_index.records))
+
+    return phone_index, customer_index
+
+
+# 이 모듈을 쓰는 프로세스에서는 전화번호 인덱스를 새로 만들 때도 고객 인덱스를 같은 읽기로 함께 생성
+register_combined_index_builder(lambda sheets_service, sheet_id: _rebuild_search_indexes(sheets_service, sheet_id)[0])
+
+
+def refresh_customer_index(sheets_service, sheet_id, max_age=0):
+    """
+    고객 인덱스를 새로 만들어 캐시에 저장 (전화번호 인덱스도 같은 읽기로 함께 생성)
+    락을 기다리는 동안 다른 스레드가 max_age초 이내의 인덱스를 만들었으면 그대로 사용
+
+    Returns:
+        CustomerIndex: 고객 인덱스
+    """
+    with index_build_lock(sheet_id):
+        index = _customer_indexes.get(sheet_id)
+        if index is not None and index.age < max_age:
+            return index
+
+        return _rebuild_search_indexes(sheets_service, sheet_id)[1]
+
+
+def get_customer_index(sheets_service, sheet_id, max_age=CUSTOMER_INDEX_TTL):
+    """
+    캐시된 고객 인덱스 가져오기
+    없으면 새로 생성, max_age초보다 오래되었으면 기존 인덱스를 바로 반환하고 백그라운드에서 새로 생성
+
+    Args:
+        sheets_service: Google Sheets API 서비스
+        sheet_id: 문서 ID
+        max_age (int): 인덱스 유효 시간 (초)
+
+    Returns:
+        CustomerIndex: 고객 인덱스
+    """
+    index = _customer_indexes.get(sheet_id)
+    return get_with_revalidate(
+        'customer_index', sheet_id, (index, index.age) if index is not None else None, max_age,
+        lambda service: refresh_customer_index(service, sheet_id, max_age),
+        sheets_service
+    )
+
+
+def search_customers(sheets_service, name=None, phone_digits=None, limit=20):
+    """
+    수도권/지방 문서에서 고객명 또는 전화번호 뒷자리로 후보 검색
+
+    Args:
+        sheets_service: Google Sheets API 서비스
+        name (str): 고객명 (일부 가능)
+        phone_digits (str): 전화번호 뒷자리 숫자 (전체 번호도 가능)
+        limit (int): 최대 후보 수
+
+    Returns:
+        list: 순위순 후보 [{'document', 'sheet_name', 'row', 'customer_name', 'action_date', 'product_list'}, ...]
+    """
+    if not name:
+        phone_digits = phone_digits_key(phone_digits)
+
+    ranked = []
+    for document_order, (document, sheet_id) in enumerate(SEARCH_DOCUMENTS):
+        index = get_customer_index(sheets_service, sheet_id)
+        if name:
+            matches = index.search_name(name)
+        else:
+            matches = index.search_phone_digits(phone_digits)
+
+        for rank_key, record_id in matches:
+            # 일치 정도 → 문서 순서(수도권 우선) → 시트/행 순서
+            ranked.append((rank_key, document_order, record_id, document, index.records[record_id]))
+
+    ranked.sort(key=lambda item: item[:3])
+
+    return [
+        {
+            'document': document,
+            'sheet_name': record[0],
+            'row': record[1],
+            'customer_name': record[3],
+            'action_date': record[4],  # 처리날짜 (C열)
+            'product_list': record[5]  # 상품명,증상 (F열)
+        }
+        for _, _, _, document, record in ranked[:limit]
+    ]
+
+
+def warm_up_search_indexes():
+    """
+    전화번호 인덱스와 고객 인덱스를 문서별 한 번의 읽기로 미리 생성
+
+    Returns:
+        dict: 단계별 소요 시간 (밀리초)과 인덱스 크기 (records: 고객 인덱스 레코드 수)
+    """
+    return warm_up(lambda sheet_id: {'records': len(_customer_indexes[sheet_id].records)})
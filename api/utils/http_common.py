@@ -0,0 +1,387 @@
+"""
+HTTP 요청/응답 공통 처리 모듈
+- JSON 요청 본문 파싱 (크기 제한)
+- JSON 응답 직렬화 (orjson 설치 시 orjson 사용)
+- Accept-Encoding에 따른 gzip 압축
+- CORS 헤더, Content-Length 설정
+- 공통 오류 응답 (400 / 401 / 413 / 500, Sheets API 회로 차단 시 503)
+- 오래된 캐시로 응답한 경우 'stale': true 표시
+- 요청 프로파일링 (X-Profile 헤더 또는 PROFILE_ENABLED 샘플링, 응답 헤더 X-Profile-Id,
+  X-Profile 헤더 요청은 응답 본문 'profile'에 hot function 요약 포함)
+- GET 요청(Vercel Cron)으로 이 함수 인스턴스의 검색 캐시 준비 (warm_up을 지정한 핸들러)
+"""
+
+import gzip
+import hmac
+import json
+import os
+import time
+from http.server import BaseHTTPRequestHandler
+
+from .sheets_common import CircuitOpenError, begin_stale_tracking, served_stale, flush_logs
+from .profiling import (
+    PROFILE_HEADER,
+    PROFILE_ID_HEADER,
+    profile_header_matches,
+    profile_requested,
+    run_profiled
+)
+
+try:
+    import orjson
+except ImportError:  # orjson이 없으면 표준 json 사용
+    orjson = None
+
+
+# 요청 본문 최대 크기 (바이트, 기본 1MB)
+MAX_REQUEST_BYTES = int(os.environ.get('MAX_REQUEST_BYTES', 1024 * 1024))
+
+# 이 크기 이상인 응답만 gzip 압축 (바이트, 기본 1KB)
+GZIP_MIN_BYTES = int(os.environ.get('GZIP_MIN_BYTES', 1024))
+
+# gzip 압축 레벨 (1=빠름 ~ 9=작음)
+GZIP_LEVEL = 5
+
+
+class RequestTooLargeError(Exception):
+    """요청 본문이 MAX_REQUEST_BYTES보다 큰 경우"""
+
+
+class UnauthorizedError(Exception):
+    """인증이 필요한 요청에 올바른 토큰이 없는 경우"""
+
+
+def bearer_token(authorization):
+    """
+    Authorization 헤더에서 Bearer 토큰 추출
+
+    Args:
+        authorization (str): Authorization 헤더 값
+
+    Returns:
+        str: 토큰 (Bearer 형식이 아니면 빈 문자열)
+    """
+    scheme, _, token = (authorization or '').partition(' ')
+    if scheme.lower() != 'bearer':
+        return ''
+    return token.strip()
+
+
+def tokens_match(token, expected):
+    """
+    인증 토큰 비교 (상수 시간, 헤더에 ASCII가 아닌 문자가 있어도 예외 없이 False)
+
+    Args:
+        token (str): 요청에서 받은 토큰
+        expected (str): 올바른 토큰
+
+    Returns:
+        bool: 일치하면 True
+    """
+    if not token or not expected:
+        return False
+    return hmac.compare_digest(token.encode('utf-8'), expected.encode('utf-8'))
+
+
+def dumps_json(data):
+    """
+    응답 데이터를 UTF-8 JSON 바이트로 직렬화
+    orjson이 있으면 orjson 사용, 없거나 직렬화할 수 없는 값이면 표준 json 사용
+
+    Args:
+        data: 직렬화할 데이터
+
+    Returns:
+        bytes: UTF-8 JSON (한글은 이스케이프하지 않음)
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(data)
+        except TypeError:
+            pass
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def loads_json(body):
+    """
+    요청 본문(JSON 바이트) 파싱
+
+    Args:
+        body (bytes): 요청 본문
+
+    Returns:
+        파싱된 데이터
+
+    Raises:
+        json.JSONDecodeError: JSON 형식 오류
+    """
+    if orjson is not None:
+        return orjson.loads(body)
+    return json.loads(body.decode('utf-8'))
+
+
+def accepts_gzip(accept_encoding):
+    """
+    Accept-Encoding 헤더가 gzip을 허용하는지 확인 (q=0이면 거부로 판단)
+
+    Args:
+        accept_encoding (str): Accept-Encoding 헤더 값
+
+    Returns:
+        bool: gzip 허용 시 True
+    """
+    for item in (accept_encoding or '').split(','):
+        parts = item.strip().split(';')
+        coding = parts[0].strip().lower()
+        if coding not in ('gzip', '*'):
+            continue
+        for param in parts[1:]:
+            name, _, value = param.strip().partition('=')
+            if name.strip() == 'q':
+                try:
+                    return float(value) > 0
+                except ValueError:
+                    return False
+        return True
+    return False
+
+
+class JSONRequestHandler(BaseHTTPRequestHandler):
+    """
+    JSON API 공통 핸들러 (Vercel Serverless Function 베이스 클래스)
+
+    서브클래스는 logger를 지정하고 handle_post(request_data)에서 응답 딕셔너리를 반환
+    ValueError → 400, JSON 오류 → 400, 인증 실패 → 401, 본문 크기 초과 → 413,
+    Sheets API 회로 차단(캐시 없음) → 503, 기타 → 500 응답
+    """
+
+    # 엔드포인트 로거 (sheets_common.get_logger로 생성)
+    logger = None
+
+    # True이면 클라이언트가 허용할 때 큰 응답을 gzip 압축
+    compress_responses = False
+
+    # CORS 허용 메소드
+    allowed_methods = 'POST, OPTIONS'
+
+    # GET 요청(Vercel Cron)에서 호출할 캐시 준비 함수 (staticmethod로 지정, 단계별 소요 시간 dict 반환)
+    # Vercel에서는 api/*.py 파일마다 인스턴스가 따로 있으므로 검색 핸들러가 자기 인스턴스를 직접 준비해야 함
+    warm_up = None
+
+    def _set_headers(self, status_code=200, content_length=None, content_encoding=None):
+        """HTTP 응답 헤더 설정"""
+        self.send_response(status_code)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.send_header('Access-Control-Allow-Methods', self.allowed_methods)
+        self.send_header('Access-Control-Allow-Headers', f'Content-Type, Authorization, {PROFILE_HEADER}')
+        self.send_header('Access-Control-Expose-Headers', PROFILE_ID_HEADER)
+        if self.compress_responses:
+            self.send_header('Vary', 'Accept-Encoding')
+        if content_encoding:
+            self.send_header('Content-Encoding', content_encoding)
+        if content_length is not None:
+            self.send_header('Content-Length', str(content_length))
+        for name, value in getattr(self, 'response_headers', {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+
+    def do_OPTIONS(self):
+        """CORS preflight 요청 처리"""
+        self._set_headers(200, content_length=0)
+
+    def do_POST(self):
+        """POST 요청 처리 - 본문을 파싱해 handle_post 호출"""
+        self._dispatch(lambda: self.handle_post(self.read_json_body()))
+
+    def do_GET(self):
+        """GET 요청 처리 - warm_up이 있는 핸들러만 지원 (Vercel Cron)"""
+        if self.warm_up is None:
+            self.send_json({'status': 'error', 'message': 'GET 요청은 지원하지 않습니다'}, 405)
+            return
+        self._dispatch(self.run_warm_up)
+
+    def run_warm_up(self):
+        """
+        CRON_SECRET 인증 확인 후 warm_up 실행 (CRON_SECRET이 없으면 인증 없이 실행)
+
+        Returns:
+            dict: 응답 본문 (단계별 소요 시간 포함)
+        """
+        cron_secret = os.environ.get('CRON_SECRET')
+        if cron_secret and not tokens_match(bearer_token(self.headers.get('Authorization')), cron_secret):
+            raise UnauthorizedError("인증 토큰이 올바르지 않습니다")
+
+        timings = self.warm_up()
+        if self.logger is not None:
+            self.logger.info('warmup_done', **timings)
+
+        return {
+            'status': 'success',
+            'message': '검색 캐시 준비 완료',
+            'timings': timings
+        }
+
+    def handle_post(self, request_data):
+        """
+        POST 요청 본문을 처리해 응답 딕셔너리 반환 (서브클래스에서 구현)
+
+        Args:
+            request_data (dict): 파싱된 요청 본문
+
+        Returns:
+            dict: 200 응답 본문
+        """
+        raise NotImplementedError
+
+    def elapsed_ms(self):
+        """현재 요청 처리 시작 후 경과 시간 (밀리초)"""
+        return round((time.perf_counter() - self.request_started) * 1000, 1)
+
+    def read_json_body(self):
+        """
+        요청 본문을 읽어 JSON 파싱
+
+        Returns:
+            dict: 파싱된 요청 본문
+
+        Raises:
+            ValueError: 본문이 비어있거나 Content-Length가 올바르지 않은 경우
+            RequestTooLargeError: 본문이 MAX_REQUEST_BYTES보다 큰 경우
+            json.JSONDecodeError: JSON 형식 오류
+        """
+        try:
+            content_length = int(self.headers.get('Content-Length', 0))
+        except ValueError:
+            raise ValueError("Content-Length 헤더가 올바르지 않습니다")
+        # 음수면 rfile.read(-1)이 연결이 닫힐 때까지 기다리므로 거부
+        if content_length < 0:
+            raise ValueError("Content-Length 헤더가 올바르지 않습니다")
+        if content_length == 0:
+            raise ValueError("요청 본문이 비어있습니다")
+        if content_length > MAX_REQUEST_BYTES:
+            raise RequestTooLargeError(
+                f"요청 본문이 너무 큽니다 (최대 {MAX_REQUEST_BYTES}바이트)"
+            )
+
+        body = self.rfile.read(content_length)
+        request_data = loads_json(body)
+        if not isinstance(request_data, dict):
+            raise ValueError("요청 본문은 JSON 객체여야 합니다")
+        return request_data
+
+    def send_json(self, data, status_code=200):
+        """
+        JSON 응답 전송 (Content-Length 설정, 조건 충족 시 gzip 압축)
+
+        Args:
+            data (dict): 응답 본문
+            status_code (int): HTTP 상태 코드
+        """
+        body = dumps_json(data)
+        content_encoding = None
+
+        if (self.compress_responses and len(body) >= GZIP_MIN_BYTES
+                and accepts_gzip(self.headers.get('Accept-Encoding'))):
+            body = gzip.compress(body, compresslevel=GZIP_LEVEL)
+            content_encoding = 'gzip'
+
+        self._set_headers(status_code, content_length=len(body), content_encoding=content_encoding)
+        self.wfile.write(body)
+
+    def _run_handle(self, handle):
+        """
+        handle 실행 - 프로파일 대상 요청이면 cProfile로 실행하고 X-Profile-Id 헤더 추가
+        X-Profile 헤더로 요청했으면 응답 본문 'profile'에 hot function 요약 추가
+        """
+        if not profile_requested(self.headers):
+            return handle()
+
+        endpoint = self.logger.endpoint if self.logger is not None else type(self).__name__
+        inline = profile_header_matches(self.headers)
+        profile = {}
+
+        def on_saved(profile_id, summary):
+            self.response_headers[PROFILE_ID_HEADER] = profile_id
+            if summary is not None:
+                profile.update(summary)
+
+        response = run_profiled(handle, endpoint, on_saved, inline=inline)
+        if profile and isinstance(response, dict):
+            response['profile'] = profile
+        return response
+
+    def _dispatch(self, handle):
+        """
+        요청 처리 공통 흐름 - 로그 샘플링, 응답 전송, 오류 응답, 응답 후 로그 출력
+
+        Args:
+            handle (callable): 인자 없이 호출하면 200 응답 딕셔너리를 반환하는 함수
+                               (응답을 직접 보낸 경우 None 반환)
+        """
+        self.request_started = time.perf_counter()
+        self.response_headers = {}
+        if self.logger is not None:
+            self.logger.begin_request()
+        begin_stale_tracking()
+
+        try:
+            response = self._run_handle(handle)
+            if response is None:
+                return
+            if served_stale() and isinstance(response, dict):
+                # Sheets API 장애/지연으로 오래된 캐시 값을 사용함
+                response['stale'] = True
+            self.send_json(response, 200)
+
+        except json.JSONDecodeError as e:
+            # JSON 파싱 오류
+            self.send_json({
+                'status': 'error',
+                'message': 'JSON 파싱 오류',
+                'error': str(e)
+            }, 400)
+
+        except UnauthorizedError as e:
+            # 인증 실패
+            self.send_json({
+                'status': 'error',
+                'message': str(e)
+            }, 401)
+
+        except RequestTooLargeError as e:
+            # 요청 본문 크기 초과
+            self.send_json({
+                'status': 'error',
+                'message': str(e)
+            }, 413)
+
+        except CircuitOpenError as e:
+            # Sheets API 장애로 호출을 건너뛰었고 캐시된 값도 없음
+            self.send_json({
+                'status': 'error',
+                'message': str(e)
+            }, 503)
+
+        except ValueError as e:
+            # 요청 파라미터 오류
+            self.send_json({
+                'status': 'error',
+                'message': str(e)
+            }, 400)
+
+        except Exception as e:
+            # 기타 오류
+            if self.logger is not None:
+                self.logger.error('request_failed', error_type=type(e).__name__, error=str(e))
+            self.send_json({
+                'status': 'error',
+                'message': '서버 오류가 발생했습니다',
+                'error': str(e),
+                'type': type(e).__name__
+            }, 500)
+
+        finally:
+            # Vercel은 응답 후 인스턴스를 멈추므로 응답을 보낸 뒤 이번 요청의 로그를 바로 출력
+            # (출력 스레드에 맡겨 두면 다음 호출 때 출력되거나 인스턴스 교체 시 유실됨)
+            flush_logs()
@@ -0,0 +1,59 @@
+"""
+문의인입 기록 공통 모듈
+수도권 문서 '문의인입' 시트의 마지막 행 다음에 한 행 추가
+
+A열: name
+B열: mobile_number
+C열: sheet_name (시트명)
+D열: action_date (기존일정)
+E열: change_date (변경원하는 일정)
+F열: request
+"""
+
+from .sheets_common import quote_sheet_name
+from .phone_search import SHEET_ID_CAPITAL
+
+# 문의인입 시트 (수도권 문서)
+INQUIRY_SHEET_ID = SHEET_ID_CAPITAL
+INQUIRY_SHEET_NAME = '문의인입'
+
+# 문의인입 시트 열 순서 (A~F)
+INQUIRY_FIELDS = ['name', 'mobile_number', 'sheet_name', 'action_date', 'change_date', 'request']
+
+
+def append_inquiry(sheets_service, inquiry, logger=None):
+    """
+    문의인입 시트에 한 행 추가
+    A열 전체를 읽어 데이터가 있는 마지막 행을 찾고 그 다음 행의 A~F열에 기록
+
+    Args:
+        sheets_service: Google Sheets API 서비스
+        inquiry (dict): INQUIRY_FIELDS 값 (없는 필드는 빈 문자열)
+        logger: 구조화 로거 (선택)
+
+    Returns:
+        int: 기록한 행 번호
+    """
+    sheet_range = quote_sheet_name(INQUIRY_SHEET_NAME)
+
+    # 현재 마지막 행 찾기
+    result = sheets_service.spreadsheets().values().get(
+        spreadsheetId=INQUIRY_SHEET_ID,
+        range=f"{sheet_range}!A:A"
+    ).execute()
+
+    last_row = len(result.get('values', []))  # 마지막 데이터 행
+    next_row = last_row + 1  # 다음 행 (새 데이터를 추가할 행)
+
+    if logger is not None:
+        logger.debug('inquiry_target_row', last_row=last_row, next_row=next_row)
+
+    # 한 번에 A~F열에 데이터 쓰기
+    sheets_service.spreadsheets().values().update(
+        spreadsheetId=INQUIRY_SHEET_ID,
+        range=f"{sheet_range}!A{next_row}:F{next_row}",
+        valueInputOption='RAW',
+        body={'values': [[inquiry.get(field, '') for field in INQUIRY_FIELDS]]}
+    ).execute()
+
+    return next_row
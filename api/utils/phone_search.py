@@ -0,0 +1,473 @@
+"""
+전화번호 검색 공통 모듈
+- 수도권/지방 문서 ID
+- 전화번호 인덱스 (H열, I열 → 첫 번째로 등장하는 시트/행)
+- 인덱스가 없을 때는 행 구간 병렬 읽기로 검색하고 인덱스는 백그라운드에서 생성
+- 인덱스의 위치에 검색한 번호가 없으면 (행 삽입/삭제) 행 구간 병렬 읽기로 다시 검색
+- 인덱스가 만료되면 기존 인덱스로 바로 응답하고 백그라운드에서 새로 생성 (stale-while-revalidate)
+- Sheets API 장애 시 인덱스에 함께 저장한 처리날짜/상품명으로 응답
+- 보관된 탭(cold)은 Google에서 읽지 않고, 보관되지 않은 탭(hot)에서 찾지 못했을 때만 로컬 보관 파일 조회
+- 캐시 사전 준비 (warm-up)
+
+열 구조:
+A-접수날짜, B-요청날짜, C-처리날짜, D-기사명, E-고객명
+F-상품명/증상, G-접수내용, H-휴대폰번호, I-전화번호
+"""
+
+import os
+import threading
+import time
+from itertools import zip_longest
+
+from .sheets_common import (
+    get_sheets_service,
+    get_cached_sheet_names,
+    get_spreadsheet_metadata,
+    plan_row_windows,
+    scan_column_windows,
+    normalize_phone,
+    batch_get_column_values,
+    format_sheet_date,
+    get_row_data,
+    get_with_revalidate,
+    mark_stale,
+    refresh_in_background,
+    is_upstream_failure,
+    search_read,
+    get_logger
+)
+from .sheet_archive import split_sheet_properties, find_archived_phone
+
+# Google Sheets 문서 ID
+SHEET_ID_CAPITAL = '1bADgRJlufpAoBGsDtyUWsHVAtmNe3ocYbcs9F3WnsCk'  # 수도권
+SHEET_ID_PROVINCE = '1Gogj_ugZ5tnGi1vXZ6iCSzQd-fXy670JeOjKRk6x-sk'  # 지방
+
+# 검색 순서 (수도권 → 지방)
+SEARCH_DOCUMENTS = [
+    ('capital', SHEET_ID_CAPITAL),
+    ('province', SHEET_ID_PROVINCE)
+]
+
+# 전화번호 조회 열 (H-휴대폰번호, I-전화번호)
+PHONE_COLUMNS = ['H', 'I']
+
+# 검색 결과 열 (C-처리날짜, F-상품명/증상)
+DETAIL_COLUMNS = ['C', 'F']
+
+# 전화번호 인덱스 유효 시간 (초)
+PHONE_INDEX_TTL = int(os.environ.get('PHONE_INDEX_TTL', 300))
+
+# 인덱스에 없는 번호는 인덱스가 이 시간(초)보다 오래되었으면 다시 만들어 확인 (새로 접수된 고객 대응)
+PHONE_INDEX_MISS_REFRESH = int(os.environ.get('PHONE_INDEX_MISS_REFRESH', 30))
+
+logger = get_logger('sheets-search-phone')
+
+
+class PhoneIndex:
+    """
+    문서 하나의 전화번호 인덱스
+    정규화된 전화번호 → (시트 이름, 행 번호), 시트 순서/행 순서상 처음 등장한 위치만 저장
+    details: (시트 이름, 행 번호) → (C열 값, F열 값) - API 장애 시 응답용 (인덱스 생성 시점 값)
+    """
+
+    def __init__(self, spreadsheet_id, sheet_names, entries, details=None):
+        self.spreadsheet_id = spreadsheet_id
+        self.sheet_names = sheet_names
+        self.entries = entries
+        self.details = details or {}
+        self.built_at = time.time()
+
+    @property
+    def age(self):
+        """인덱스 생성 후 경과 시간 (초)"""
+        return time.time() - self.built_at
+
+    def lookup(self, normalized_phone):
+        """
+        전화번호 위치 조회
+
+        Returns:
+            tuple: (시트 이름, 행 번호), 없으면 None
+        """
+        if not normalized_phone:
+            return None
+        return self.entries.get(normalized_phone)
+
+
+# 문서별 전화번호 인덱스 캐시 {spreadsheet_id: PhoneIndex}
+_phone_indexes = {}
+_phone_index_lock = threading.Lock()
+
+# 문서별 인덱스 생성 락 {spreadsheet_id: Lock}
+# 한 문서의 인덱스를 읽는 동안 다른 문서의 조회/생성은 막지 않고, 같은 문서를 동시에 두 번 읽지 않음
+_index_build_locks = {}
+
+
+# 전화번호 인덱스와 같은 열 읽기로 다른 인덱스도 함께 만드는 생성 함수 (customer_index가 등록)
+# (sheets_service, sheet_id) → PhoneIndex, 함께 만든 인덱스와 전화번호 인덱스는 생성 함수가 캐시에 저장
+_combined_index_builder = None
+
+
+def register_combined_index_builder(builder):
+    """
+    전화번호 인덱스를 새로 만들 때 대신 사용할 생성 함수 등록 (고객 인덱스와 한 번의 읽기 공유)
+
+    Args:
+        builder (callable): (sheets_service, sheet_id) → PhoneIndex, 인덱스 생성 락 안에서 호출됨
+    """
+    global _combined_index_builder
+    _combined_index_builder = builder
+
+
+def index_build_lock(sheet_id):
+    """
+    문서별 검색 인덱스 생성 락
+
+    Args:
+        sheet_id: 문서 ID
+
+    Returns:
+        threading.Lock: 이 문서의 인덱스 생성 락
+    """
+    with _phone_index_lock:
+        return _index_build_locks.setdefault(sheet_id, threading.Lock())
+
+
+def build_phone_index(sheets_service, sheet_id):
+    """
+    문서의 보관되지 않은(hot) 모든 시트에서 C, F, H, I열을 한 번에 읽어 전화번호 인덱스 생성
+
+    Args:
+        sheets_service: Google Sheets API 서비스
+        sheet_id: 문서 ID
+
+    Returns:
+        PhoneIndex: 전화번호 인덱스
+    """
+    # 보관된 시트를 제외한 시트 이름 가져오기
+    metadata = get_spreadsheet_metadata(sheets_service, sheet_id)
+    hot_sheets, cold_sheets, _ = split_sheet_properties(sheets_service, sheet_id, metadata)
+    sheet_names = [props['title'] for props in hot_sheets]
+
+    # 모든 시트의 H열(휴대폰번호), I열(전화번호)과 결과 열(C, F) 데이터 한 번에 가져오기 (열 단위 배치 읽기)
+    all_data = batch_get_column_values(sheets_service, sheet_id, sheet_names, DETAIL_COLUMNS + PHONE_COLUMNS)
+
+    index = index_phone_columns(sheet_id, sheet_names, all_data)
+    logger.debug('phone_index_built', spreadsheet=sheet_id[:10], sheet_count=len(sheet_names),
+                 archived_sheet_count=len(cold_sheets), phone_count=len(index.entries))
+
+    return index
+
+
+def index_phone_columns(sheet_id, sheet_names, all_data):
+    """
+    이미 읽은 열 값으로 전화번호 인덱스 생성 (고객 인덱스와 한 번의 읽기를 공유할 때 사용)
+
+    Args:
+        sheet_id: 문서 ID
+        sheet_names (list): 인덱스에 포함할 시트 이름 (검색 순서)
+        all_data (dict): {시트이름: {열: [값, ...]}} (C, F, H, I열 포함)
+
+    Returns:
+        PhoneIndex: 전화번호 인덱스
+    """
+    entries = {}
+    details = {}
+    for sheet_name in sheet_names:
+        h_column = all_data[sheet_name].get('H', [])  # 휴대폰번호
+        i_column = all_data[sheet_name].get('I', [])  # 전화번호
+        c_column = all_data[sheet_name].get('C', [])  # 처리날짜
+        f_column = all_data[sheet_name].get('F', [])  # 상품명,증상
+
+        # 먼저 등장한 위치가 우선 (행 번호는 1부터 시작)
+        for row_number, values in enumerate(zip_longest(h_column, i_column, fillvalue=''), start=1):
+            for value in values:
+                if value:
+                    key = normalize_phone(value)
+                    if key and key not in entries:
+                        entries[key] = (sheet_name, row_number)
+                        details[(sheet_name, row_number)] = (
+                            c_column[row_number - 1] if row_number <= len(c_column) else '',
+                            f_column[row_number - 1] if row_number <= len(f_column) else ''
+                        )
+
+    return PhoneIndex(sheet_id, sheet_names, entries, details)
+
+
+def store_phone_index(index):
+    """
+    새로 만든 전화번호 인덱스를 캐시에 저장 (기존 인덱스와 교체)
+
+    Args:
+        index (PhoneIndex): 전화번호 인덱스
+    """
+    with _phone_index_lock:
+        _phone_indexes[index.spreadsheet_id] = index
+
+
+def refresh_phone_index(sheets_service, sheet_id, max_age=0):
+    """
+    전화번호 인덱스를 새로 만들어 캐시에 저장 (문서별 락, 다른 문서의 인덱스 생성/조회는 기다리지 않음)
+    함께 만드는 생성 함수가 등록되어 있으면 그 함수로 고객 인덱스와 함께 생성
+    락을 기다리는 동안 다른 스레드가 max_age초 이내의 인덱스를 만들었으면 그대로 사용
+
+    Returns:
+        PhoneIndex: 전화번호 인덱스
+    """
+    with index_build_lock(sheet_id):
+        index = _phone_indexes.get(sheet_id)
+        if index is not None and index.age < max_age:
+            return index
+
+        if _combined_index_builder is not None:
+            return _combined_index_builder(sheets_service, sheet_id)
+
+        index = build_phone_index(sheets_service, sheet_id)
+        store_phone_index(index)
+        return index
+
+
+def get_phone_index(sheets_service, sheet_id, max_age=PHONE_INDEX_TTL, stale_ok=True):
+    """
+    캐시된 전화번호 인덱스 가져오기
+    - 없으면 새로 생성
+    - max_age초보다 오래되었으면 기존 인덱스를 바로 반환하고 백그라운드에서 새로 생성 (stale_ok)
+
+    Args:
+        sheets_service: Google Sheets API 서비스
+        sheet_id: 문서 ID
+        max_age (int): 인덱스 유효 시간 (초)
+        stale_ok (bool): False면 오래된 인덱스는 동기로 새로 생성 (API 장애 시에만 기존 인덱스 사용)
+
+    Returns:
+        PhoneIndex: 전화번호 인덱스
+    """
+    index = _phone_indexes.get(sheet_id)
+    return get_with_revalidate(
+        'phone_index', sheet_id, (index, index.age) if index is not None else None, max_age,
+        lambda service: refresh_phone_index(service, sheet_id, max_age),
+        sheets_service, stale_ok=stale_ok
+    )
+
+
+def schedule_phone_index_build(sheet_id, max_age=PHONE_INDEX_TTL):
+    """
+    전화번호 인덱스를 백그라운드 스레드에서 생성 (이미 생성 중이면 무시)
+
+    Args:
+        sheet_id: 문서 ID
+        max_age (int): 이 시간(초) 이내에 만든 인덱스가 있으면 다시 만들지 않음 (0이면 항상 새로 생성)
+    """
+    refresh_in_background('phone_index', sheet_id,
+                          lambda service: refresh_phone_index(service, sheet_id, max_age))
+
+
+def stream_search_phone(sheets_service, sheet_id, normalized_phone):
+    """
+    인덱스 없이 행 구간 병렬 읽기로 전화번호 위치 검색 (보관된 시트 제외)
+    시트/행 순서상 가장 앞선 위치가 확정되면 나머지 구간은 기다리지 않음
+
+    Args:
+        sheets_service: Google Sheets API 서비스
+        sheet_id: 문서 ID
+        normalized_phone: 정규화된 전화번호
+
+    Returns:
+        tuple: (시트 이름, 행 번호), 없으면 None
+    """
+    if not normalized_phone:
+        return None
+
+    metadata = get_spreadsheet_metadata(sheets_service, sheet_id)
+    hot_sheets, _, _ = split_sheet_properties(sheets_service, sheet_id, metadata)
+    windows = plan_row_windows(hot_sheets)
+
+    def scan(sheet_name, start_row, column_values):
+        for offset, values in enumerate(zip_longest(*column_values, fillvalue='')):
+            for value in values:
+                if value and normalize_phone(value) == normalized_phone:
+                    return (sheet_name, start_row + offset)
+        return None
+
+    return scan_column_windows(sheet_id, windows, PHONE_COLUMNS, scan)
+
+
+def locate_phone(sheets_service, sheet_id, normalized_phone):
+    """
+    문서에서 전화번호 위치 찾기
+
+    - 인덱스가 있으면 인덱스 조회 (인덱스에 없고 오래되었으면 다시 만들어 확인, API 장애 시 기존 인덱스 결과 사용)
+    - 인덱스가 없으면 (콜드 스타트) 행 구간 병렬 검색 후 인덱스는 백그라운드에서 생성
+
+    Returns:
+        tuple: (시트 이름, 행 번호), 없으면 None
+    """
+    if sheet_id not in _phone_indexes:
+        location = stream_search_phone(sheets_service, sheet_id, normalized_phone)
+        schedule_phone_index_build(sheet_id)
+        return location
+
+    index = get_phone_index(sheets_service, sheet_id)
+    location = index.lookup(normalized_phone)
+
+    # 인덱스에 없으면 그 사이 추가된 행일 수 있으므로 오래된 인덱스는 다시 만들어 확인
+    if location is None and index.age >= PHONE_INDEX_MISS_REFRESH:
+        index = get_phone_index(sheets_service, sheet_id, max_age=PHONE_INDEX_MISS_REFRESH, stale_ok=False)
+        location = index.lookup(normalized_phone)
+
+    return location
+
+
+def fetch_row_details(sheets_service, sheet_id, location, normalized_phone):
+    """
+    매칭된 행의 C열(처리날짜), F열(상품명,증상) 값 가져오기 (날짜는 일련번호로 받아 변환)
+    H열, I열도 함께 읽어 검색한 번호가 아직 그 행에 있는지 확인 (인덱스 생성 후 행이 삽입/삭제되면 위치가 바뀜)
+    API 장애 시 인덱스 생성 시점의 값 사용
+
+    Returns:
+        dict: {'C': 값, 'F': 값, ...}, 그 행에 검색한 번호가 없으면 None
+    """
+    sheet_name, found_row = location
+    try:
+        with search_read():
+            row_data = get_row_data(sheets_service, sheet_id, sheet_name, found_row, DETAIL_COLUMNS + PHONE_COLUMNS,
+                                    value_render_option='UNFORMATTED_VALUE')
+    except Exception as e:
+        index = _phone_indexes.get(sheet_id)
+        detail = index.details.get(location) if index is not None else None
+        if detail is None or not is_upstream_failure(e):
+            raise
+        logger.warning('row_detail_from_index', error_type=type(e).__name__, index_age=round(index.age, 1))
+        mark_stale()
+        return dict(zip(DETAIL_COLUMNS, detail))
+
+    if not any(normalize_phone(row_data[column]) == normalized_phone
+               for column in PHONE_COLUMNS if row_data[column]):
+        return None
+    return row_data
+
+
+def locate_row_details(sheets_service, sheet_id, normalized_phone):
+    """
+    전화번호 위치를 찾고 그 행의 값 가져오기
+    인덱스의 위치에 번호가 없으면 (행 삽입/삭제) 인덱스 대신 행 구간 병렬 검색으로 다시 찾고 인덱스는 백그라운드에서 새로 생성
+
+    Returns:
+        tuple: ((시트 이름, 행 번호), {열: 값}), 없으면 None
+    """
+    location = locate_phone(sheets_service, sheet_id, normalized_phone)
+    if location is None:
+        return None
+
+    row_data = fetch_row_details(sheets_service, sheet_id, location, normalized_phone)
+    if row_data is not None:
+        return location, row_data
+
+    logger.info('phone_index_moved', sheet_name=location[0], row=location[1])
+    schedule_phone_index_build(sheet_id, max_age=0)
+    location = stream_search_phone(sheets_service, sheet_id, normalized_phone)
+    if location is None:
+        return None
+
+    row_data = fetch_row_details(sheets_service, sheet_id, location, normalized_phone)
+    return (location, row_data) if row_data is not None else None
+
+
+def search_phone_in_sheet(sheets_service, sheet_id, normalized_phone):
+    """
+    하나의 Google Sheets 문서에서 전화번호 검색
+
+    Args:
+        sheets_service: Google Sheets API 서비스
+        sheet_id: 검색할 문서 ID
+        normalized_phone: 정규화된 전화번호
+
+    Returns:
+        dict: 검색 결과 (found, sheet_name, row, action_date, product_list)
+              찾지 못하면 found=False
+    """
+    located = locate_row_details(sheets_service, sheet_id, normalized_phone)
+
+    if located is None:
+        # hot 시트에 없으면 보관된 시트에서 검색 (보관 파일 값으로 응답)
+        archived = find_archived_phone(sheets_service, sheet_id, normalized_phone, DETAIL_COLUMNS)
+        if archived is None:
+            # 찾지 못함
+            return {'found': False}
+
+        sheet_name, found_row, row_data = archived
+        logger.debug('phone_matched_archive', sheet_name=sheet_name, row=found_row)
+    else:
+        (sheet_name, found_row), row_data = located
+        logger.debug('phone_matched', sheet_name=sheet_name, row=found_row)
+
+    return {
+        'found': True,
+        'sheet_name': sheet_name,
+        'row': found_row,
+        'action_date': format_sheet_date(row_data.get('C', '')),  # 처리날짜
+        'product_list': str(row_data.get('F', ''))  # 상품명,증상
+    }
+
+
+def search_phone(sheets_service, normalized_phone):
+    """
+    수도권 문서 → 지방 문서 순서로 전화번호 검색
+
+    Args:
+        sheets_service: Google Sheets API 서비스
+        normalized_phone: 정규화된 전화번호
+
+    Returns:
+        dict: 검색 결과 (search_phone_in_sheet와 동일)
+    """
+    result = {'found': False}
+    for stage, sheet_id in SEARCH_DOCUMENTS:
+        logger.debug('search_document', stage=stage)
+        result = search_phone_in_sheet(sheets_service, sheet_id, normalized_phone)
+        if result['found']:
+            break
+    return result
+
+
+def warm_up(index_sizes=None):
+    """
+    검색에 필요한 캐시를 미리 준비 (API 클라이언트, 시트 이름 목록, 전화번호 인덱스)
+    sheets는 인덱스에 포함된 hot 시트 수, archived_sheets는 보관 파일에서 조회하는 시트 수
+
+    Args:
+        index_sizes (callable): 문서 ID → 함께 만든 인덱스의 크기 dict (문서별 결과에 추가)
+
+    Returns:
+        dict: 단계별 소요 시간 (밀리초)과 인덱스 크기
+    """
+    def elapsed_ms(started):
+        return round((time.perf_counter() - started) * 1000, 1)
+
+    total_started = time.perf_counter()
+    timings = {}
+
+    started = time.perf_counter()
+    sheets_service = get_sheets_service()
+    timings['client_ms'] = elapsed_ms(started)
+
+    for stage, sheet_id in SEARCH_DOCUMENTS:
+        started = time.perf_counter()
+        sheet_names = get_cached_sheet_names(sheets_service, sheet_id, max_age=0)
+        metadata_ms = elapsed_ms(started)
+
+        started = time.perf_counter()
+        index = refresh_phone_index(sheets_service, sheet_id)
+
+        timings[stage] = {
+            'metadata_ms': metadata_ms,
+            'index_ms': elapsed_ms(started),
+            'sheets': len(index.sheet_names),
+            'archived_sheets': len(sheet_names) - len(index.sheet_names),
+            'phones': len(index.entries)
+        }
+        if index_sizes is not None:
+            timings[stage].update(index_sizes(sheet_id))
+
+    timings['total_ms'] = elapsed_ms(total_started)
+    return timings
@@ -0,0 +1,221 @@
+"""
+요청 단위 프로파일링 (cProfile)
+- PROFILE_ENABLED=1이면 PROFILE_SAMPLE_RATE 비율로 요청을 샘플링해 프로파일
+- X-Profile: <PROFILE_TOKEN> 헤더가 있는 요청은 항상 프로파일
+- 프로파일은 PROFILE_DIR에 .prof 파일로 저장 (최근 PROFILE_KEEP개), 응답 헤더 X-Profile-Id로 ID 전달
+- X-Profile 헤더로 요청한 프로파일은 hot function 상위 INLINE_FUNCTIONS개를 응답 본문 'profile'에 함께 반환
+  (Vercel에서는 api/*.py 파일마다 인스턴스가 따로 있어 다른 함수에서 프로파일을 조회할 수 없음)
+- 프로파일한 요청 전체의 함수별 누적 통계 (hot function)
+- 다운로드/통계 조회는 api/profiles.py (같은 프로세스에서 처리하는 자체 서버 전용)
+
+cProfile은 요청을 처리한 스레드만 측정 (행 구간 병렬 읽기 스레드의 시간은 결과를 기다린 시간으로 나타남)
+"""
+
+import cProfile
+import hmac
+import os
+import pstats
+import random
+import re
+import secrets
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+
+# 샘플링 프로파일 사용 여부, 비율 (0~1)
+PROFILE_ENABLED = os.environ.get('PROFILE_ENABLED', '').lower() in ('1', 'true', 'yes')
+PROFILE_SAMPLE_RATE = float(os.environ.get('PROFILE_SAMPLE_RATE', 0.01))
+
+# X-Profile 헤더 / 프로파일 다운로드 인증 토큰 (없으면 헤더 프로파일과 다운로드 모두 사용 안 함)
+PROFILE_TOKEN = os.environ.get('PROFILE_TOKEN', '')
+
+# 프로파일 저장 폴더 (Vercel에서는 /tmp만 쓰기 가능), 보관 개수
+PROFILE_DIR = os.environ.get('PROFILE_DIR', os.path.join(tempfile.gettempdir(), 'sheets-profiles'))
+PROFILE_KEEP = int(os.environ.get('PROFILE_KEEP', 50))
+
+# 헤더 프로파일 응답에 포함할 hot function 수
+INLINE_FUNCTIONS = 20
+
+# Vercel에서 실행 중인지 (프로파일 조회 API 사용 불가)
+ON_VERCEL = bool(os.environ.get('VERCEL'))
+
+PROFILE_HEADER = 'X-Profile'
+PROFILE_ID_HEADER = 'X-Profile-Id'
+
+_PROFILE_ID = re.compile(r'^\d+-[0-9a-f]{8}$')
+
+# 동시에 하나의 요청만 프로파일 (Python 3.12부터 cProfile은 프로세스에 하나만 활성화 가능)
+_profile_lock = threading.Lock()
+
+# 저장된 프로파일 {profile_id: {'endpoint', 'duration_ms', 'created_at'}} (오래된 순)
+_profiles = OrderedDict()
+
+# 프로파일한 요청 전체의 누적 통계
+_aggregate = None
+_aggregate_requests = 0
+_aggregate_lock = threading.Lock()
+
+
+def profile_header_matches(headers):
+    """
+    X-Profile 헤더가 PROFILE_TOKEN과 일치하는지 확인 (바이트로 비교해 ASCII가 아닌 헤더도 예외 없이 False)
+
+    Args:
+        headers: 요청 헤더
+
+    Returns:
+        bool: 일치하면 True
+    """
+    token = headers.get(PROFILE_HEADER) if headers is not None else None
+    if not token or not PROFILE_TOKEN:
+        return False
+    return hmac.compare_digest(token.encode('utf-8'), PROFILE_TOKEN.encode('utf-8'))
+
+
+def profile_requested(headers):
+    """
+    이번 요청을 프로파일할지 결정
+
+    Args:
+        headers: 요청 헤더
+
+    Returns:
+        bool: X-Profile 헤더가 PROFILE_TOKEN과 일치하거나 샘플링되었으면 True
+    """
+    if profile_header_matches(headers):
+        return True
+    return PROFILE_ENABLED and random.random() < PROFILE_SAMPLE_RATE
+
+
+def run_profiled(func, endpoint, on_saved, inline=False):
+    """
+    func를 cProfile로 실행하고 프로파일 저장 (다른 요청을 프로파일 중이면 그냥 실행)
+
+    Args:
+        func (callable): 인자 없는 함수
+        endpoint (str): 엔드포인트 이름
+        on_saved (callable): on_saved(프로파일 ID, 요약) - 저장 후 호출 (func가 예외를 던져도 호출)
+                             요약은 inline이면 {'profile_id', 'endpoint', 'duration_ms', 'functions'}, 아니면 None
+        inline (bool): True면 응답에 넣을 hot function 요약 생성
+
+    Returns:
+        func 반환값
+    """
+    if not _profile_lock.acquire(blocking=False):
+        return func()
+
+    try:
+        profiler = cProfile.Profile()
+        started = time.perf_counter()
+        try:
+            return profiler.runcall(func)
+        finally:
+            profile_id = _save_profile(profiler, endpoint, started)
+            summary = None
+            if inline:
+                summary = {
+                    'profile_id': profile_id,
+                    **_profiles.get(profile_id, {'endpoint': endpoint}),
+                    'functions': _top_functions(pstats.Stats(profiler), INLINE_FUNCTIONS)
+                }
+            on_saved(profile_id, summary)
+    finally:
+        _profile_lock.release()
+
+
+def _save_profile(profiler, endpoint, started):
+    global _aggregate, _aggregate_requests
+
+    duration_ms = round((time.perf_counter() - started) * 1000, 1)
+    profile_id = f'{int(time.time())}-{secrets.token_hex(4)}'
+
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    profiler.dump_stats(profile_path(profile_id))
+
+    with _aggregate_lock:
+        stats = pstats.Stats(profiler)
+        if _aggregate is None:
+            _aggregate = stats
+        else:
+            _aggregate.add(stats)
+        _aggregate_requests += 1
+
+        _profiles[profile_id] = {'endpoint': endpoint, 'duration_ms': duration_ms, 'created_at': time.time()}
+        while len(_profiles) > PROFILE_KEEP:
+            old_id, _ = _profiles.popitem(last=False)
+            try:
+                os.remove(profile_path(old_id))
+            except OSError:
+                pass
+
+    return profile_id
+
+
+def profile_path(profile_id):
+    """
+    프로파일 ID의 .prof 파일 경로
+
+    Raises:
+        ValueError: ID 형식이 잘못된 경우
+    """
+    if not _PROFILE_ID.match(str(profile_id)):
+        raise ValueError(f"프로파일 ID 형식이 올바르지 않습니다: {profile_id}")
+    return os.path.join(PROFILE_DIR, f'{profile_id}.prof')
+
+
+def _top_functions(stats, limit):
+    """pstats 통계에서 자체 실행 시간(tottime)이 큰 함수 목록"""
+    rows = sorted(stats.stats.items(), key=lambda item: item[1][2], reverse=True)[:limit]
+    return [
+        {
+            'function': function_name,
+            'file': '/'.join(file_name.replace('\\', '/').split('/')[-2:]),
+            'line': line,
+            'calls': calls,
+            'self_ms': round(self_time * 1000, 2),
+            'cumulative_ms': round(cumulative_time * 1000, 2)
+        }
+        for (file_name, line, function_name), (_, calls, self_time, cumulative_time, _) in rows
+    ]
+
+
+def hot_functions(limit=30):
+    """
+    프로파일한 요청 전체의 누적 hot function 통계
+
+    Returns:
+        dict: {'requests': 프로파일한 요청 수, 'functions': [함수별 호출 수, 자체/누적 시간], ...}
+    """
+    with _aggregate_lock:
+        if _aggregate is None:
+            return {'requests': 0, 'functions': []}
+        return {'requests': _aggregate_requests, 'functions': _top_functions(_aggregate, limit)}
+
+
+def profile_summary(profile_id, limit=30):
+    """
+    저장된 프로파일 하나의 hot function 통계
+
+    Raises:
+        ValueError: 프로파일이 없는 경우
+    """
+    path = profile_path(profile_id)
+    if not os.path.exists(path):
+        raise ValueError(f"프로파일을 찾을 수 없습니다: {profile_id}")
+    info = _profiles.get(profile_id, {})
+    return {'profile_id': profile_id, **info, 'functions': _top_functions(pstats.Stats(path), limit)}
+
+
+def list_profiles():
+    """저장된 프로파일 목록 (최근 순)"""
+    with _aggregate_lock:
+        return [{'profile_id': profile_id, **info} for profile_id, info in reversed(_profiles.items())]
+
+
+def reset_profiles():
+    """누적 통계 초기화 (저장된 .prof 파일은 유지)"""
+    global _aggregate, _aggregate_requests
+    with _aggregate_lock:
+        _aggregate = None
+        _aggregate_requests = 0
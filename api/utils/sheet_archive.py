@@ -0,0 +1,449 @@
+"""
+마감된 시트(탭) 보관 계층 (hot/cold)
+- 이름 규칙(ARCHIVE_TAB_PATTERN) 또는 나이 규칙(ARCHIVE_MIN_AGE_DAYS)에 맞는 탭을 로컬 압축 파일로 한 번만 내보냄
+- 보관 파일: 문서별 gzip JSON, 탭마다 열 단위 값(C, E, F, H, I) + 전화번호 인덱스 + 원본 지문(fingerprint)
+- 검색은 보관되지 않은 탭(hot)만 Google에서 읽고, 찾지 못했을 때만 보관 파일(cold)을 조회
+- 보관 후 원본 탭에 행이 추가되었거나 그리드 행 수가 바뀌면 그 탭은 다시 hot으로 취급 (재생성 필요)
+  메타데이터를 새로 조회할 때마다 보관된 데이터 다음 행부터 끝까지 읽어 추가된 행 확인 (빈 응답이면 그대로)
+- 재생성/일관성 검사: python archive_sheets.py rebuild | check
+- 전화번호 인덱스는 번호마다 모든 보관 탭의 위치를 저장 (앞선 탭이 hot이 되거나 삭제되면 다음 탭의 위치 사용)
+
+열 구조:
+A-접수날짜, B-요청날짜, C-처리날짜, D-기사명, E-고객명
+F-상품명/증상, G-접수내용, H-휴대폰번호, I-전화번호
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from datetime import datetime, timedelta
+from itertools import zip_longest
+
+from .sheets_common import (
+    SHEETS_EPOCH,
+    batch_get_column_values,
+    get_spreadsheet_metadata,
+    is_upstream_failure,
+    normalize_phone,
+    quote_sheet_name,
+    get_logger
+)
+
+# 보관 파일 폴더 (기본: 프로젝트 루트의 archive/)
+ARCHIVE_DIR = os.environ.get(
+    'ARCHIVE_DIR',
+    os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'archive')
+)
+
+# 보관할 탭 이름 규칙 (정규식, 예: '^2024년'), 비어 있으면 이름 규칙 사용 안 함
+ARCHIVE_TAB_PATTERN = os.environ.get('ARCHIVE_TAB_PATTERN', '')
+
+# 보관할 탭 나이 규칙 - 가장 최근 처리날짜(C열)가 이 일수보다 오래된 탭 (0이면 사용 안 함)
+ARCHIVE_MIN_AGE_DAYS = int(os.environ.get('ARCHIVE_MIN_AGE_DAYS', 0))
+
+# 보관하는 열 (C-처리날짜, E-고객명, F-상품명/증상, H-휴대폰번호, I-전화번호)
+ARCHIVE_COLUMNS = ['C', 'E', 'F', 'H', 'I']
+
+# 보관 파일 형식 버전
+ARCHIVE_VERSION = 1
+
+logger = get_logger('sheet-archive')
+
+
+def archive_path(spreadsheet_id):
+    """문서의 보관 파일 경로"""
+    return os.path.join(ARCHIVE_DIR, f'{spreadsheet_id}.json.gz')
+
+
+def fingerprint(columns):
+    """
+    탭의 보관 열 값 지문 (일관성 검사용)
+
+    Args:
+        columns (dict): {'C': [값, ...], 'E': [...], ...}
+
+    Returns:
+        str: sha256 앞 16자리
+    """
+    payload = json.dumps([columns.get(column, []) for column in ARCHIVE_COLUMNS],
+                         ensure_ascii=False, separators=(',', ':'), default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]
+
+
+def _latest_date(values):
+    """날짜 일련번호 값 중 가장 최근 날짜 (숫자 값이 없으면 None)"""
+    serials = [value for value in values
+               if isinstance(value, (int, float)) and not isinstance(value, bool) and value > 0]
+    if not serials:
+        return None
+    return SHEETS_EPOCH + timedelta(days=max(serials))
+
+
+def is_cold_tab(title, columns, now=None):
+    """
+    보관 규칙에 맞는 탭인지 확인
+
+    Args:
+        title (str): 탭 이름
+        columns (dict): 탭의 열 값 (나이 규칙에 C열 사용)
+        now (datetime): 기준 시각 (기본: 현재)
+
+    Returns:
+        bool: 이름 규칙 또는 나이 규칙에 맞으면 True
+    """
+    if ARCHIVE_TAB_PATTERN and re.search(ARCHIVE_TAB_PATTERN, title):
+        return True
+
+    if ARCHIVE_MIN_AGE_DAYS > 0:
+        latest = _latest_date(columns.get('C', [])[1:])  # 헤더 행 제외
+        if latest is not None and (now or datetime.now()) - latest >= timedelta(days=ARCHIVE_MIN_AGE_DAYS):
+            return True
+
+    return False
+
+
+class SheetArchive:
+    """
+    문서 하나의 보관 파일
+
+    tabs: {탭 이름: {'row_count', 'column_count', 'fingerprint', 'columns': {'C': [...], ...}}}
+    phone_index: 정규화된 전화번호 → [(탭 이름, 행 번호), ...], 탭마다 처음 등장한 위치 (탭 순서)
+    """
+
+    def __init__(self, spreadsheet_id, data):
+        self.spreadsheet_id = spreadsheet_id
+        self.created_at = data.get('created_at', 0)
+        self.tabs = data.get('tabs', {})
+        self.phone_index = {
+            phone: [tuple(location) for location in locations]
+            for phone, locations in data.get('phone_index', {}).items()
+        }
+
+        # 보관된 데이터 행 수 (열 끝의 빈 셀은 저장되지 않으므로 열 중 가장 긴 길이)
+        self.data_rows = {
+            title: max((len(tab['columns'].get(column, [])) for column in ARCHIVE_COLUMNS), default=0)
+            for title, tab in self.tabs.items()
+        }
+
+        # 행이 추가된 탭 확인 결과 (확인에 사용한 메타데이터 조회 시각, 탭 이름 set)
+        self._grown = (None, set())
+
+    def grown_titles(self, sheets_service, metadata):
+        """
+        보관 후 행이 추가된 탭 (메타데이터를 새로 조회했을 때만 확인, 결과는 다음 조회까지 재사용)
+        보관된 데이터 다음 행부터 그리드 끝까지 보관 열을 한 번의 batchGet으로 읽어 값이 있으면 추가된 것으로 판단
+
+        Args:
+            sheets_service: Google Sheets API 서비스
+            metadata (SpreadsheetMetadata): 현재 메타데이터
+
+        Returns:
+            set: 탭 이름
+        """
+        checked_at, grown = self._grown
+        if checked_at == metadata.fetched_at:
+            return grown
+
+        targets = []
+        for title, tab in self.tabs.items():
+            sheet = metadata.sheets.get(title)
+            if sheet is None or sheet['row_count'] != tab['row_count']:
+                continue  # 삭제되었거나 그리드가 바뀐 탭은 확인하지 않아도 hot
+            first_row = self.data_rows[title] + 1
+            if first_row <= sheet['row_count']:
+                targets.extend((title, f"{quote_sheet_name(title)}!{column}{first_row}:{column}")
+                               for column in ARCHIVE_COLUMNS)
+
+        grown = set()
+        if targets:
+            try:
+                result = sheets_service.spreadsheets().values().batchGet(
+                    spreadsheetId=self.spreadsheet_id,
+                    ranges=[sheet_range for _, sheet_range in targets]
+                ).execute()
+            except Exception as e:
+                if not is_upstream_failure(e):
+                    raise
+                # 확인하지 못하면 이전 결과 사용 (다음 호출 때 다시 확인)
+                logger.warning('archive_tail_check_failed', spreadsheet=self.spreadsheet_id[:10],
+                               error_type=type(e).__name__)
+                return self._grown[1]
+
+            for (title, _), value_range in zip(targets, result.get('valueRanges', [])):
+                if value_range.get('values'):
+                    grown.add(title)
+
+        for title in grown:
+            logger.warning('archive_tab_grown', spreadsheet=self.spreadsheet_id[:10], sheet_name=title,
+                           archived_rows=self.data_rows[title])
+
+        self._grown = (metadata.fetched_at, grown)
+        return grown
+
+    def cold_titles(self, sheets_service, metadata):
+        """
+        지금 cold로 취급할 탭 이름
+        (삭제된 탭, 보관 후 그리드 행 수가 바뀐 탭, 행이 추가된 탭은 제외)
+
+        Args:
+            sheets_service: Google Sheets API 서비스 (추가된 행 확인용)
+            metadata (SpreadsheetMetadata): 현재 메타데이터
+
+        Returns:
+            set: 탭 이름
+        """
+        titles = set()
+        for title, tab in self.tabs.items():
+            sheet = metadata.sheets.get(title)
+            if sheet is None:
+                continue
+            if sheet['row_count'] != tab['row_count']:
+                logger.warning('archive_tab_changed', spreadsheet=self.spreadsheet_id[:10], sheet_name=title,
+                               archived_rows=tab['row_count'], current_rows=sheet['row_count'])
+                continue
+            titles.add(title)
+        return titles - self.grown_titles(sheets_service, metadata)
+
+    def lookup_phone(self, normalized_phone, cold_titles):
+        """
+        보관된 탭에서 전화번호 위치 조회 (지금 cold인 탭 중 탭 순서상 처음 위치)
+
+        Returns:
+            tuple: (탭 이름, 행 번호), 없으면 None
+        """
+        if not normalized_phone:
+            return None
+        for location in self.phone_index.get(normalized_phone, ()):
+            if location[0] in cold_titles:
+                return location
+        return None
+
+    def column_values(self, title):
+        """
+        보관된 탭의 열 값 (batch_get_column_values 결과와 같은 형식)
+
+        Returns:
+            dict: {'C': [값, ...], 'E': [...], ...}
+        """
+        return self.tabs[title]['columns']
+
+    def row_values(self, title, row_number, columns):
+        """
+        보관된 행의 열 값
+
+        Returns:
+            dict: {'C': 값, 'F': 값, ...} (없는 값은 '')
+        """
+        tab_columns = self.tabs[title]['columns']
+        return {
+            column: tab_columns.get(column, [])[row_number - 1]
+            if row_number <= len(tab_columns.get(column, [])) else ''
+            for column in columns
+        }
+
+
+# 불러온 보관 파일 캐시 {spreadsheet_id: (파일 수정 시각, SheetArchive 또는 None)}
+_archives = {}
+_archives_lock = threading.Lock()
+
+
+def get_archive(spreadsheet_id):
+    """
+    문서의 보관 파일 불러오기 (파일이 바뀌었으면 다시 불러옴)
+
+    Returns:
+        SheetArchive: 보관 파일, 없으면 None
+    """
+    path = archive_path(spreadsheet_id)
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        return None
+
+    cached = _archives.get(spreadsheet_id)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+
+    with _archives_lock:
+        cached = _archives.get(spreadsheet_id)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+
+        try:
+            with gzip.open(path, 'rt', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.error('archive_load_failed', spreadsheet=spreadsheet_id[:10],
+                         error_type=type(e).__name__, error=str(e))
+            archive = None
+        else:
+            archive = SheetArchive(spreadsheet_id, data) if data.get('version') == ARCHIVE_VERSION else None
+
+        _archives[spreadsheet_id] = (mtime, archive)
+        return archive
+
+
+def split_sheet_properties(sheets_service, spreadsheet_id, metadata):
+    """
+    탭 목록을 hot/cold로 나누기
+
+    Args:
+        sheets_service: Google Sheets API 서비스 (추가된 행 확인용)
+        spreadsheet_id: 스프레드시트 ID
+        metadata (SpreadsheetMetadata): 현재 메타데이터
+
+    Returns:
+        tuple: (hot 탭 목록 (get_sheet_properties 형식), cold 탭 이름 set, SheetArchive 또는 None)
+    """
+    sheet_properties = metadata.sheet_properties()
+    archive = get_archive(spreadsheet_id)
+    if archive is None:
+        return sheet_properties, set(), None
+
+    cold = archive.cold_titles(sheets_service, metadata)
+    return [props for props in sheet_properties if props['title'] not in cold], cold, archive
+
+
+def find_archived_phone(sheets_service, spreadsheet_id, normalized_phone, columns):
+    """
+    보관된 탭에서 전화번호 검색 (hot 탭에서 찾지 못했을 때 사용)
+
+    Args:
+        sheets_service: Google Sheets API 서비스 (캐시된 메타데이터 확인용)
+        spreadsheet_id: 스프레드시트 ID
+        normalized_phone: 정규화된 전화번호
+        columns (list): 함께 반환할 열 (예: ['C', 'F'])
+
+    Returns:
+        tuple: (탭 이름, 행 번호, {열: 값}), 없으면 None
+    """
+    archive = get_archive(spreadsheet_id)
+    if archive is None or normalized_phone not in archive.phone_index:
+        return None
+
+    metadata = get_spreadsheet_metadata(sheets_service, spreadsheet_id)
+    location = archive.lookup_phone(normalized_phone, archive.cold_titles(sheets_service, metadata))
+    if location is None:
+        return None
+
+    sheet_name, row_number = location
+    return sheet_name, row_number, archive.row_values(sheet_name, row_number, columns)
+
+
+def build_archive(sheets_service, spreadsheet_id, now=None):
+    """
+    보관 규칙에 맞는 탭을 읽어 보관 파일 생성 (기존 파일은 교체)
+
+    Args:
+        sheets_service: Google Sheets API 서비스
+        spreadsheet_id: 스프레드시트 ID
+        now (datetime): 나이 규칙 기준 시각 (기본: 현재)
+
+    Returns:
+        dict: {'path', 'tabs': [보관한 탭 이름], 'rows', 'phones', 'bytes'}
+    """
+    metadata = get_spreadsheet_metadata(sheets_service, spreadsheet_id, max_age=0)
+    all_data = batch_get_column_values(sheets_service, spreadsheet_id, metadata.titles, ARCHIVE_COLUMNS)
+
+    tabs = {}
+    phone_index = {}
+    for title in metadata.titles:
+        columns = all_data[title]
+        if not is_cold_tab(title, columns, now):
+            continue
+
+        sheet = metadata.sheets[title]
+        tabs[title] = {
+            'row_count': sheet['row_count'],
+            'column_count': sheet['column_count'],
+            'fingerprint': fingerprint(columns),
+            'columns': columns
+        }
+
+        # 탭마다 먼저 등장한 위치만 저장 (행 번호는 1부터 시작)
+        # 어느 탭이 나중에 hot이 되거나 삭제되어도 다음 탭의 위치로 찾을 수 있도록 모든 탭의 위치 보관
+        for row_number, values in enumerate(zip_longest(columns['H'], columns['I'], fillvalue=''), start=1):
+            for value in values:
+                if value:
+                    key = normalize_phone(value)
+                    if not key:
+                        continue
+                    locations = phone_index.setdefault(key, [])
+                    if not locations or locations[-1][0] != title:
+                        locations.append([title, row_number])
+
+    data = {
+        'version': ARCHIVE_VERSION,
+        'spreadsheet_id': spreadsheet_id,
+        'created_at': time.time(),
+        'columns': ARCHIVE_COLUMNS,
+        'tabs': tabs,
+        'phone_index': phone_index
+    }
+
+    # 임시 파일에 쓴 뒤 교체 (검색 중인 프로세스가 쓰다 만 파일을 읽지 않도록)
+    os.makedirs(ARCHIVE_DIR, exist_ok=True)
+    path = archive_path(spreadsheet_id)
+    temp_path = f'{path}.tmp'
+    with gzip.open(temp_path, 'wt', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, separators=(',', ':'), default=str)
+    os.replace(temp_path, path)
+
+    logger.info('archive_built', spreadsheet=spreadsheet_id[:10], tab_count=len(tabs), phone_count=len(phone_index))
+
+    return {
+        'path': path,
+        'tabs': list(tabs),
+        'rows': sum(max((len(values) for values in tab['columns'].values()), default=0) for tab in tabs.values()),
+        'phones': len(phone_index),
+        'bytes': os.path.getsize(path)
+    }
+
+
+def check_archive(sheets_service, spreadsheet_id, now=None):
+    """
+    보관 파일과 원본 탭 비교
+
+    탭별 상태:
+    - ok: 원본과 같음
+    - grown: 보관 후 행이 추가됨 (검색에서는 hot으로 취급 중)
+    - changed: 원본 값이 바뀜 (지문 불일치)
+    - grid_changed: 원본 그리드 행 수가 바뀜 (검색에서는 hot으로 취급 중)
+    - missing: 원본 탭이 삭제됨
+    - not_archived: 보관 규칙에 맞지만 보관되지 않은 탭
+
+    Returns:
+        dict: {'ok': 모두 일치하면 True, 'archived': 보관 파일 존재 여부, 'tabs': [{'sheet_name', 'status'}, ...]}
+    """
+    archive = get_archive(spreadsheet_id)
+    metadata = get_spreadsheet_metadata(sheets_service, spreadsheet_id, max_age=0)
+    all_data = batch_get_column_values(sheets_service, spreadsheet_id, metadata.titles, ARCHIVE_COLUMNS)
+    archived_tabs = archive.tabs if archive is not None else {}
+
+    results = []
+    for title, tab in archived_tabs.items():
+        if title not in metadata.sheets:
+            status = 'missing'
+        elif metadata.sheets[title]['row_count'] != tab['row_count']:
+            status = 'grid_changed'
+        elif fingerprint(all_data[title]) != tab['fingerprint']:
+            live = all_data[title]
+            grown = all(live.get(column, [])[:len(values)] == values for column, values in tab['columns'].items())
+            status = 'grown' if grown else 'changed'
+        else:
+            status = 'ok'
+        results.append({'sheet_name': title, 'status': status})
+
+    for title in metadata.titles:
+        if title not in archived_tabs and is_cold_tab(title, all_data[title], now):
+            results.append({'sheet_name': title, 'status': 'not_archived'})
+
+    return {
+        'ok': all(result['status'] == 'ok' for result in results),
+        'archived': archive is not None,
+        'tabs': results
+    }
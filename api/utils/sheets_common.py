@@ -1,15 +1,32 @@
 """
 Google Sheets 공통 기능 모듈
 - 인증
+- 스프레드시트 메타데이터 LRU 캐시 (시트 목록, 그리드 크기, 헤더 행)
 - 데이터 읽기/쓰기 공통 함수
 - 전화번호 변환 등 유틸리티 함수
+- 큰 시트의 행 구간 분할 병렬 읽기 (우선순위 결과 확정 시 조기 종료)
+- Sheets API 회로 차단기, 캐시 stale-while-revalidate
+- 구조화 로깅 (레벨, 엔드포인트별 샘플링, 전화번호 마스킹, 비동기 출력)
 """
 
 import json
 import os
+import sys
 import base64
+import random
+import time
+import threading
+import queue
+import atexit
+import math
+import re
+from collections import OrderedDict
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta, timezone
 from google.oauth2 import service_account
 from googleapiclient.discovery import build
+from googleapiclient.http import HttpRequest
 
 
 # Google Sheets API 스코프
@@ -19,9 +36,19 @@ SCOPES = [
 ]
 
 
-def get_sheets_service():
+# 스프레드시트 메타데이터 캐시 - 최대 문서 수, 유효 시간 (초)
+METADATA_CACHE_SIZE = int(os.environ.get('METADATA_CACHE_SIZE', 64))
+METADATA_CACHE_TTL = int(os.environ.get('METADATA_CACHE_TTL', 300))
+
+# 인증 정보와 API 클라이언트 캐시 (인스턴스가 살아있는 동안 재사용)
+_credentials = None
+_credentials_lock = threading.Lock()
+_thread_services = threading.local()
+
+
+def load_credentials():
     """
-    Google Sheets API 서비스 객체 생성
+    Service Account 인증 정보 생성
     환경 변수에서 Service Account 정보를 읽어 인증
     """
     # Base64 인코딩된 환경 변수 먼저 시도
@@ -36,11 +63,62 @@ def get_sheets_service():
             raise ValueError("환경 변수 GOOGLE_SERVICE_ACCOUNT_BASE64 또는 GOOGLE_SERVICE_ACCOUNT_JSON이 설정되지 않았습니다")
 
     service_account_info = json.loads(service_account_json)
-    credentials = service_account.Credentials.from_service_account_info(
+    return service_account.Credentials.from_service_account_info(
         service_account_info, scopes=SCOPES
     )
 
-    return build('sheets', 'v4', credentials=credentials)
+
+def get_credentials():
+    """
+    캐시된 Service Account 인증 정보 가져오기 (처음 호출 시 생성)
+    액세스 토큰은 만료되면 google-auth가 자동으로 갱신
+    """
+    global _credentials
+    if _credentials is None:
+        with _credentials_lock:
+            if _credentials is None:
+                _credentials = load_credentials()
+    return _credentials
+
+
+def get_sheets_service():
+    """
+    Google Sheets API 서비스 객체 가져오기
+    스레드별로 한 번만 생성해 재사용 (httplib2 기반 클라이언트는 스레드 간 공유 불가)
+    모든 요청은 회로 차단기(sheets_breaker)를 거쳐 실행
+    """
+    service = getattr(_thread_services, 'service', None)
+    if service is None:
+        service = build('sheets', 'v4', credentials=get_credentials(), requestBuilder=_GuardedHttpRequest)
+        _thread_services.service = service
+    return service
+
+
+def get_sheet_properties(sheets_service, spreadsheet_id):
+    """
+    스프레드시트의 모든 시트(탭) 이름과 그리드 크기 가져오기
+
+    Args:
+        sheets_service: Google Sheets API 서비스 객체
+        spreadsheet_id: 스프레드시트 ID
+
+    Returns:
+        list: [{'title': 시트 이름, 'row_count': 행 수, 'column_count': 열 수}, ...] (시트 순서)
+    """
+    spreadsheet = sheets_service.spreadsheets().get(
+        spreadsheetId=spreadsheet_id,
+        fields='sheets.properties(title,gridProperties(rowCount,columnCount))'
+    ).execute()
+
+    properties = []
+    for sheet in spreadsheet.get('sheets', []):
+        grid = sheet['properties'].get('gridProperties', {})
+        properties.append({
+            'title': sheet['properties']['title'],
+            'row_count': grid.get('rowCount', 0),
+            'column_count': grid.get('columnCount', 0)
+        })
+    return properties
 
 
 def get_all_sheet_names(sheets_service, spreadsheet_id):
@@ -62,6 +140,363 @@ def get_all_sheet_names(sheets_service, spreadsheet_id):
     return [sheet['properties']['title'] for sheet in sheets]
 
 
+def quote_sheet_name(sheet_name):
+    """
+    A1 표기법용 시트 이름 인용 (작은따옴표로 감싸고 내부 작은따옴표는 두 번 씀)
+    예: 고객's 목록 → '고객''s 목록'
+    """
+    return "'" + str(sheet_name).replace("'", "''") + "'"
+
+
+def column_to_index(column):
+    """컬럼 문자를 0부터 시작하는 인덱스로 변환 (A=0, Z=25, AA=26)"""
+    index = 0
+    for char in column.upper():
+        index = index * 26 + (ord(char) - ord('A') + 1)
+    return index - 1
+
+
+def index_to_column(index):
+    """0부터 시작하는 인덱스를 컬럼 문자로 변환 (0=A, 25=Z, 26=AA)"""
+    column = ''
+    index += 1
+    while index > 0:
+        index, remainder = divmod(index - 1, 26)
+        column = chr(ord('A') + remainder) + column
+    return column
+
+
+class LRUCache:
+    """
+    크기 제한 + 항목별 유효 시간이 있는 LRU 캐시 (스레드 안전)
+
+    maxsize개를 넘으면 가장 오래 사용하지 않은 항목부터 제거
+    유효 시간이 지난 항목도 stale 응답에 쓸 수 있도록 크기 제한으로 밀려날 때까지 보관
+    """
+
+    def __init__(self, maxsize, ttl):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, max_age=None):
+        """
+        캐시 값 가져오기
+
+        Args:
+            key: 캐시 키
+            max_age (float): 이 시간(초)보다 오래된 값은 없는 것으로 취급 (기본: ttl)
+
+        Returns:
+            캐시 값, 없거나 만료되었으면 None
+        """
+        max_age = self.ttl if max_age is None else max_age
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            stored_at, value = entry
+            if time.time() - stored_at >= max_age:
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def peek(self, key):
+        """
+        유효 시간과 관계없이 캐시 값과 경과 시간 가져오기
+
+        Returns:
+            tuple: (캐시 값, 저장 후 경과 시간(초)), 없으면 None
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            stored_at, value = entry
+            return value, time.time() - stored_at
+
+    def put(self, key, value):
+        """캐시 값 저장 (크기 초과 시 가장 오래 사용하지 않은 항목 제거)"""
+        with self._lock:
+            self._entries[key] = (time.time(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def pop(self, key):
+        """캐시 값 제거"""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class SpreadsheetMetadata:
+    """
+    스프레드시트 하나의 메타데이터
+
+    sheets: {시트 이름: {'row_count': 행 수, 'column_count': 열 수, 'header': [1행 값, ...]}}
+    titles: 시트 이름 리스트 (시트 순서)
+    """
+
+    def __init__(self, spreadsheet_id, sheet_properties, headers):
+        self.spreadsheet_id = spreadsheet_id
+        self.fetched_at = time.time()
+        self.titles = [props['title'] for props in sheet_properties]
+        self.sheets = {
+            props['title']: {
+                'row_count': props['row_count'],
+                'column_count': props['column_count'],
+                'header': headers.get(props['title'], [])
+            }
+            for props in sheet_properties
+        }
+
+    @property
+    def age(self):
+        """조회 후 경과 시간 (초)"""
+        return time.time() - self.fetched_at
+
+    def sheet_properties(self):
+        """get_sheet_properties와 같은 형식의 시트 목록"""
+        return [
+            {'title': title, 'row_count': self.sheets[title]['row_count'],
+             'column_count': self.sheets[title]['column_count']}
+            for title in self.titles
+        ]
+
+    def header_column(self, sheet_name, header_name):
+        """
+        헤더 이름으로 컬럼 문자 찾기
+
+        Returns:
+            str: 컬럼 문자 (예: 'E'), 없으면 None
+        """
+        header = self.sheets.get(sheet_name, {}).get('header', [])
+        for index, value in enumerate(header):
+            if str(value).strip() == str(header_name).strip():
+                return index_to_column(index)
+        return None
+
+
+_metadata_cache = LRUCache(METADATA_CACHE_SIZE, METADATA_CACHE_TTL)
+
+
+def fetch_spreadsheet_metadata(sheets_service, spreadsheet_id):
+    """
+    스프레드시트 메타데이터 조회 (시트 목록/그리드 크기 1회 + 헤더 행 배치 읽기 1회)
+
+    Args:
+        sheets_service: Google Sheets API 서비스 객체
+        spreadsheet_id: 스프레드시트 ID
+
+    Returns:
+        SpreadsheetMetadata: 메타데이터
+    """
+    sheet_properties = get_sheet_properties(sheets_service, spreadsheet_id)
+
+    headers = {}
+    titles = [props['title'] for props in sheet_properties if props['row_count'] > 0]
+    if titles:
+        result = sheets_service.spreadsheets().values().batchGet(
+            spreadsheetId=spreadsheet_id,
+            ranges=[f"{quote_sheet_name(title)}!1:1" for title in titles]
+        ).execute()
+        for title, value_range in zip(titles, result.get('valueRanges', [])):
+            values = value_range.get('values', [])
+            headers[title] = values[0] if values else []
+
+    return SpreadsheetMetadata(spreadsheet_id, sheet_properties, headers)
+
+
+def refresh_spreadsheet_metadata(sheets_service, spreadsheet_id):
+    """스프레드시트 메타데이터를 새로 조회해 캐시에 저장"""
+    metadata = fetch_spreadsheet_metadata(sheets_service, spreadsheet_id)
+    _metadata_cache.put(spreadsheet_id, metadata)
+    return metadata
+
+
+def get_spreadsheet_metadata(sheets_service, spreadsheet_id, max_age=None):
+    """
+    캐시된 스프레드시트 메타데이터 가져오기
+    만료되었으면 오래된 값을 바로 반환하고 백그라운드에서 새로 조회 (stale-while-revalidate)
+
+    Args:
+        sheets_service: Google Sheets API 서비스 객체
+        spreadsheet_id: 스프레드시트 ID
+        max_age (float): 이 시간(초)보다 오래된 캐시는 다시 조회 (기본: METADATA_CACHE_TTL,
+                         0이면 항상 동기로 조회하고 실패할 때만 캐시 사용)
+
+    Returns:
+        SpreadsheetMetadata: 메타데이터
+    """
+    max_age = METADATA_CACHE_TTL if max_age is None else max_age
+    return get_with_revalidate(
+        'metadata', spreadsheet_id, _metadata_cache.peek(spreadsheet_id), max_age,
+        lambda service: refresh_spreadsheet_metadata(service, spreadsheet_id),
+        sheets_service, stale_ok=max_age > 0
+    )
+
+
+def peek_spreadsheet_metadata(spreadsheet_id):
+    """
+    API를 호출하지 않고 캐시된 메타데이터만 가져오기 (유효 시간과 관계없이)
+
+    Args:
+        spreadsheet_id: 스프레드시트 ID
+
+    Returns:
+        SpreadsheetMetadata: 캐시된 메타데이터, 없으면 None
+    """
+    cached = _metadata_cache.peek(spreadsheet_id)
+    return cached[0] if cached is not None else None
+
+
+def get_cached_sheet_names(sheets_service, spreadsheet_id, max_age=None):
+    """
+    스프레드시트의 모든 시트(탭) 이름 가져오기 (메타데이터 캐시 사용)
+
+    Args:
+        sheets_service: Google Sheets API 서비스 객체
+        spreadsheet_id: 스프레드시트 ID
+        max_age (float): 캐시 유효 시간 (초, 기본: METADATA_CACHE_TTL)
+
+    Returns:
+        list: 시트 이름 리스트
+    """
+    return get_spreadsheet_metadata(sheets_service, spreadsheet_id, max_age).titles
+
+
+def get_sheet_metadata(sheets_service, spreadsheet_id, sheet_name):
+    """
+    시트 하나의 메타데이터 가져오기
+    캐시에 없는 시트면 새로 추가된 탭일 수 있으므로 한 번 다시 조회
+
+    Args:
+        sheets_service: Google Sheets API 서비스 객체
+        spreadsheet_id: 스프레드시트 ID
+        sheet_name: 시트 이름
+
+    Returns:
+        tuple: (SpreadsheetMetadata, 시트 메타데이터 dict)
+
+    Raises:
+        ValueError: 시트가 없는 경우
+    """
+    metadata = get_spreadsheet_metadata(sheets_service, spreadsheet_id)
+    if sheet_name not in metadata.sheets:
+        # 조회 실패 시 오래된 캐시로 '시트 없음'을 판단하지 않도록 캐시 대체 없이 조회
+        metadata = refresh_spreadsheet_metadata(sheets_service, spreadsheet_id)
+    if sheet_name not in metadata.sheets:
+        raise ValueError(f"시트를 찾을 수 없습니다: {sheet_name}")
+    return metadata, metadata.sheets[sheet_name]
+
+
+# A1 범위 (예: A:Z, A1:C10, B2:D) - 시트 이름 제외
+_A1_RANGE = re.compile(r'^([A-Za-z]{1,3})(\d*)(?::([A-Za-z]{1,3})(\d*))?$')
+
+
+class RangeOutsideGridError(ValueError):
+    """A1 범위의 시작 위치가 (캐시된) 시트 그리드 밖인 경우"""
+
+
+def clamp_range(range_notation, row_count, column_count):
+    """
+    A1 범위를 시트 그리드 크기에 맞게 조정
+    - 끝 컬럼이 그리드를 넘으면 마지막 컬럼으로 줄임
+    - 끝 행이 그리드를 넘으면 끝 행 없이 (시트 끝까지) 읽음
+    - 열 범위 형식이 아니면 (예: 2:10 행 범위, 이름 있는 범위) 그대로 API에 전달
+
+    Args:
+        range_notation (str): A1 범위 (예: 'A:Z', 'A1:C10')
+        row_count (int): 시트 행 수
+        column_count (int): 시트 열 수
+
+    Returns:
+        tuple: (조정된 범위, 시작 컬럼 인덱스, 끝 컬럼 인덱스, 끝 컬럼을 줄였는지 여부)
+               열 범위 형식이 아니면 시작 컬럼 인덱스는 0, 끝 컬럼 인덱스는 None
+
+    Raises:
+        ValueError: 시작 컬럼이 끝 컬럼보다 뒤인 경우
+        RangeOutsideGridError: 시작 위치가 그리드 밖인 경우
+    """
+    match = _A1_RANGE.match(str(range_notation).strip())
+    if not match:
+        return range_notation, 0, None, False
+
+    start_col, start_row, end_col, end_row = match.groups()
+    start_row = start_row or ''
+    if not end_col:
+        # 'C', 'C5'처럼 끝이 없으면 한 칸(열)만 읽음
+        end_col, end_row = start_col, start_row
+    end_row = end_row or ''
+    start_index = column_to_index(start_col)
+    end_index = column_to_index(end_col)
+
+    if start_index > end_index:
+        raise ValueError(f"range의 시작 컬럼이 끝 컬럼보다 뒤에 있습니다: {range_notation}")
+    if start_index >= column_count:
+        raise RangeOutsideGridError(
+            f"range가 시트 범위를 벗어났습니다: {range_notation} (최대 {index_to_column(column_count - 1)}열)"
+        )
+    if start_row and int(start_row) > row_count:
+        raise RangeOutsideGridError(f"range가 시트 범위를 벗어났습니다: {range_notation} (최대 {row_count}행)")
+
+    columns_clamped = end_index > column_count - 1
+    end_index = min(end_index, column_count - 1)
+    if end_row and int(end_row) > row_count:
+        end_row = ''
+
+    start = f"{start_col.upper()}{start_row}"
+    end = f"{index_to_column(end_index)}{end_row}"
+    if not start_row and end_row:
+        start = f"{start_col.upper()}1"
+    return f"{start}:{end}", start_index, end_index, columns_clamped
+
+
+def clamp_sheet_range(sheets_service, spreadsheet_id, sheet_name, range_notation):
+    """
+    시트의 A1 범위를 그리드 크기에 맞게 조정 (메타데이터 캐시 사용)
+    - 시작 위치가 캐시된 그리드 밖이면 그 사이 시트가 늘어났을 수 있으므로 다시 조회해 확인
+    - 끝 컬럼을 줄여야 하는데 캐시가 METADATA_CACHE_TTL보다 오래되었으면 (stale 응답) 다시 조회해 확인
+      (오래된 그리드 크기로 새로 추가된 열을 잘라내지 않도록)
+
+    Args:
+        sheets_service: Google Sheets API 서비스 객체
+        spreadsheet_id: 스프레드시트 ID
+        sheet_name: 시트 이름
+        range_notation (str): A1 범위
+
+    Returns:
+        tuple: (SpreadsheetMetadata, 조정된 범위, 시작 컬럼 인덱스, 끝 컬럼 인덱스 (열 범위 형식이 아니면 None))
+
+    Raises:
+        ValueError: 시트가 없거나 범위가 잘못되었거나 최신 그리드 밖인 경우
+    """
+    metadata, sheet = get_sheet_metadata(sheets_service, spreadsheet_id, sheet_name)
+    refreshed = False
+
+    while True:
+        try:
+            clamped, start_index, end_index, columns_clamped = clamp_range(
+                range_notation, sheet['row_count'], sheet['column_count']
+            )
+            if refreshed or not columns_clamped or metadata.age < METADATA_CACHE_TTL:
+                return metadata, clamped, start_index, end_index
+        except RangeOutsideGridError:
+            if refreshed:
+                raise
+
+        metadata = refresh_spreadsheet_metadata(sheets_service, spreadsheet_id)
+        if sheet_name not in metadata.sheets:
+            raise ValueError(f"시트를 찾을 수 없습니다: {sheet_name}")
+        sheet = metadata.sheets[sheet_name]
+        refreshed = True
+
+
 def normalize_phone(phone):
     """
     전화번호를 한국 표준 형식으로 변환
@@ -72,9 +507,10 @@ def normalize_phone(phone):
     - +8210-5217-0838 → 010-5217-0838
     - +821052170838 → 010-5217-0838
     - 01052170838 → 010-5217-0838
+    - 1052170838 (숫자 셀, 앞자리 0 누락) → 010-5217-0838
 
     Args:
-        phone (str): 원본 전화번호
+        phone (str | int | float): 원본 전화번호 (UNFORMATTED_VALUE로 읽은 숫자 셀 포함)
 
     Returns:
         str: 정규화된 전화번호 (010-xxxx-xxxx 형식)
@@ -82,6 +518,12 @@ def normalize_phone(phone):
     if not phone:
         return ""
 
+    # 숫자로 저장된 셀은 앞자리 0이 빠져 있으므로 복원 (국가번호 82로 시작하는 경우 제외)
+    if isinstance(phone, (int, float)) and not isinstance(phone, bool):
+        phone = str(int(phone))
+        if not phone.startswith("82"):
+            phone = "0" + phone
+
     # 공백, 하이픈 제거
     phone = str(phone).strip().replace(" ", "").replace("-", "")
 
@@ -148,7 +590,7 @@ def batch_get_columns(sheets_service, spreadsheet_id, sheet_names, columns):
     ranges = []
     for sheet_name in sheet_names:
         for column in columns:
-            ranges.append(f"'{sheet_name}'!{column}:{column}")
+            ranges.append(f"{quote_sheet_name(sheet_name)}!{column}:{column}")
 
     # 배치 읽기 실행
     result = sheets_service.spreadsheets().values().batchGet(
@@ -173,7 +615,98 @@ def batch_get_columns(sheets_service, spreadsheet_id, sheet_names, columns):
     return data
 
 
-def get_row_data(sheets_service, spreadsheet_id, sheet_name, row_number, columns):
+def batch_get_column_values(sheets_service, spreadsheet_id, sheet_names, columns,
+                            value_render_option='UNFORMATTED_VALUE'):
+    """
+    여러 시트의 특정 컬럼들을 한 번에 가져오기 (열 단위 배치 읽기)
+    majorDimension=COLUMNS로 읽어 열마다 평평한 값 리스트를 반환
+    (batch_get_columns의 [[값1], [값2], ...] 대비 응답 JSON과 파이썬 객체 수가 적음)
+
+    UNFORMATTED_VALUE(기본)로 읽으면 날짜는 일련번호(숫자)로 오므로 format_sheet_date로 변환
+
+    Args:
+        sheets_service: Google Sheets API 서비스 객체
+        spreadsheet_id: 스프레드시트 ID
+        sheet_names (list): 시트 이름 리스트
+        columns (list): 컬럼 리스트 (예: ['H', 'I'])
+        value_render_option (str): 'UNFORMATTED_VALUE' 또는 'FORMATTED_VALUE'
+
+    Returns:
+        dict: {
+            'sheet_name': {
+                'H': [값1, 값2, ...],
+                'I': [값1, 값2, ...]
+            }
+        }
+        빈 셀은 '' (각 열 끝의 빈 셀은 생략됨)
+    """
+    if not sheet_names:
+        return {}  # 모든 시트가 보관된 경우 등 - API 호출 안 함
+
+    ranges = []
+    for sheet_name in sheet_names:
+        for column in columns:
+            ranges.append(f"{quote_sheet_name(sheet_name)}!{column}:{column}")
+
+    result = sheets_service.spreadsheets().values().batchGet(
+        spreadsheetId=spreadsheet_id,
+        ranges=ranges,
+        majorDimension='COLUMNS',
+        valueRenderOption=value_render_option,
+        dateTimeRenderOption='SERIAL_NUMBER'
+    ).execute()
+
+    value_ranges = result.get('valueRanges', [])
+
+    data = {}
+    idx = 0
+    for sheet_name in sheet_names:
+        data[sheet_name] = {}
+        for column in columns:
+            values = value_ranges[idx].get('values') if idx < len(value_ranges) else None
+            # 한 열만 요청했으므로 values는 [[값1, 값2, ...]] 형태
+            data[sheet_name][column] = values[0] if values else []
+            idx += 1
+
+    return data
+
+
+# Google Sheets 날짜 일련번호 기준일 (1899-12-30 = 0)
+SHEETS_EPOCH = datetime(1899, 12, 30)
+
+
+def format_sheet_date(value):
+    """
+    날짜 셀 값을 문자열로 변환
+
+    - 일련번호(UNFORMATTED_VALUE): 45971 → 2025-11-10, 45971.5 → 2025-11-10 12:00:00
+    - 문자열: 시간 부분이 00:00:00이면 제거 (2025-11-10 00:00:00 → 2025-11-10)
+
+    Args:
+        value: 셀 값 (숫자 또는 문자열)
+
+    Returns:
+        str: 날짜 문자열
+    """
+    if value is None or value == '':
+        return ''
+
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        moment = SHEETS_EPOCH + timedelta(days=value)
+        # 초 미만 오차 반올림
+        moment = (moment + timedelta(milliseconds=500)).replace(microsecond=0)
+        if moment.hour == 0 and moment.minute == 0 and moment.second == 0:
+            return moment.strftime('%Y-%m-%d')
+        return moment.strftime('%Y-%m-%d %H:%M:%S')
+
+    value = str(value)
+    if ' 00:00:00' in value:
+        value = value.replace(' 00:00:00', '')
+    return value
+
+
+def get_row_data(sheets_service, spreadsheet_id, sheet_name, row_number, columns,
+                 value_render_option='FORMATTED_VALUE'):
     """
     특정 시트의 특정 행에서 여러 컬럼 값 가져오기
 
@@ -183,6 +716,8 @@ def get_row_data(sheets_service, spreadsheet_id, sheet_name, row_number, columns
         sheet_name: 시트 이름
         row_number: 행 번호 (1부터 시작)
         columns (list): 컬럼 리스트 (예: ['C', 'F'])
+        value_render_option (str): 'FORMATTED_VALUE'(기본) 또는 'UNFORMATTED_VALUE'
+                                   (UNFORMATTED_VALUE이면 날짜는 일련번호로 반환)
 
     Returns:
         dict: {'C': '값1', 'F': '값2'}
@@ -190,11 +725,13 @@ def get_row_data(sheets_service, spreadsheet_id, sheet_name, row_number, columns
     # 범위 생성 (예: "시트1!C5:F5")
     start_col = min(columns)
     end_col = max(columns)
-    range_notation = f"'{sheet_name}'!{start_col}{row_number}:{end_col}{row_number}"
+    range_notation = f"{quote_sheet_name(sheet_name)}!{start_col}{row_number}:{end_col}{row_number}"
 
     result = sheets_service.spreadsheets().values().get(
         spreadsheetId=spreadsheet_id,
-        range=range_notation
+        range=range_notation,
+        valueRenderOption=value_render_option,
+        dateTimeRenderOption='SERIAL_NUMBER'
     ).execute()
 
     values = result.get('values', [[]])[0] if result.get('values') else []
@@ -215,3 +752,701 @@ def get_row_data(sheets_service, spreadsheet_id, sheet_name, row_number, columns
             result_dict[col] = ''
 
     return result_dict
+
+
+# ============================================================
+# 행 구간 분할 병렬 읽기
+# ============================================================
+
+# 한 구간(window)의 최소 행 수 - 이보다 작은 시트는 통째로 한 구간
+SHARD_WINDOW_MIN_ROWS = int(os.environ.get('SHARD_WINDOW_MIN_ROWS', 1000))
+
+# 시트 하나를 나누는 최대 구간 수 (구간 크기 = rowCount / 구간 수)
+SHARD_MAX_WINDOWS = int(os.environ.get('SHARD_MAX_WINDOWS', 8))
+
+# batchGet 요청 하나에 담는 최대 행 수 (작은 구간들은 한 요청으로 묶음)
+SHARD_REQUEST_ROWS = int(os.environ.get('SHARD_REQUEST_ROWS', 5000))
+
+# 동시에 실행할 읽기 요청 수
+READ_WORKERS = int(os.environ.get('READ_WORKERS', 4))
+
+# 읽기 스레드 풀 (스레드별 API 클라이언트를 재사용하도록 프로세스 전체에서 공유)
+_read_executor = None
+_read_executor_lock = threading.Lock()
+
+
+def get_read_executor():
+    """공유 읽기 스레드 풀 가져오기 (처음 호출 시 생성)"""
+    global _read_executor
+    if _read_executor is None:
+        with _read_executor_lock:
+            if _read_executor is None:
+                _read_executor = ThreadPoolExecutor(max_workers=READ_WORKERS, thread_name_prefix='sheets-read')
+    return _read_executor
+
+
+def plan_row_windows(sheet_properties):
+    """
+    시트별 rowCount로 행 구간 나누기
+
+    Args:
+        sheet_properties (list): get_sheet_properties 결과
+
+    Returns:
+        list: [(시트 이름, 시작 행, 끝 행), ...] 시트 순서/행 순서 (행 번호는 1부터 시작)
+              시트의 마지막 구간은 끝 행이 None (캐시된 rowCount 이후 추가된 행까지 시트 끝까지 읽음)
+    """
+    windows = []
+    for props in sheet_properties:
+        row_count = props['row_count']
+        if row_count <= 0:
+            continue
+
+        window_rows = max(math.ceil(row_count / SHARD_MAX_WINDOWS), SHARD_WINDOW_MIN_ROWS)
+        starts = list(range(1, row_count + 1, window_rows))
+        for start_row in starts[:-1]:
+            windows.append((props['title'], start_row, start_row + window_rows - 1))
+        windows.append((props['title'], starts[-1], None))
+
+    return windows
+
+
+def _pack_windows(windows, request_rows):
+    """연속된 구간을 행 수 합이 request_rows를 넘지 않도록 요청 단위로 묶기"""
+    requests = []
+    current = []
+    current_rows = 0
+    for window in windows:
+        # 끝 행이 없는 구간은 최소 구간 크기로 계산
+        rows = window[2] - window[1] + 1 if window[2] is not None else SHARD_WINDOW_MIN_ROWS
+        if current and current_rows + rows > request_rows:
+            requests.append(current)
+            current = []
+            current_rows = 0
+        current.append(window)
+        current_rows += rows
+    if current:
+        requests.append(current)
+    return requests
+
+
+def _scan_window_request(spreadsheet_id, windows, columns, scan, value_render_option):
+    """
+    구간 묶음 하나를 읽고 구간 순서대로 scan 실행
+
+    Returns:
+        scan이 처음으로 반환한 None이 아닌 값, 없으면 None
+    """
+    ranges = []
+    for sheet_name, start_row, end_row in windows:
+        for column in columns:
+            ranges.append(f"{quote_sheet_name(sheet_name)}!{column}{start_row}:{column}{end_row or ''}")
+
+    # 작업 스레드마다 별도 API 클라이언트 사용 (검색 경로 조회 - 지연 예산 적용)
+    with search_read():
+        result = get_sheets_service().spreadsheets().values().batchGet(
+            spreadsheetId=spreadsheet_id,
+            ranges=ranges,
+            majorDimension='COLUMNS',
+            valueRenderOption=value_render_option,
+            dateTimeRenderOption='SERIAL_NUMBER'
+        ).execute()
+
+    value_ranges = result.get('valueRanges', [])
+
+    idx = 0
+    for sheet_name, start_row, _ in windows:
+        column_values = []
+        for _ in columns:
+            values = value_ranges[idx].get('values') if idx < len(value_ranges) else None
+            column_values.append(values[0] if values else [])
+            idx += 1
+
+        match = scan(sheet_name, start_row, column_values)
+        if match is not None:
+            return match
+
+    return None
+
+
+def scan_column_windows(spreadsheet_id, windows, columns, scan,
+                        value_render_option='UNFORMATTED_VALUE', request_rows=SHARD_REQUEST_ROWS):
+    """
+    행 구간들을 병렬로 읽으면서 도착하는 대로 scan 실행, 우선순위가 가장 높은 결과를 반환
+
+    앞선 구간이 모두 끝나 결과가 확정되면 나머지 구간은 기다리지 않음
+    (아직 시작하지 않은 요청은 취소, 실행 중인 요청은 결과를 버림)
+
+    Args:
+        spreadsheet_id: 스프레드시트 ID
+        windows (list): plan_row_windows 결과 (우선순위 순서)
+        columns (list): 읽을 컬럼 리스트 (예: ['H', 'I'])
+        scan (callable): scan(시트 이름, 시작 행, [컬럼별 값 리스트]) → 결과 또는 None
+                         구간 안에서 가장 앞선 결과를 반환해야 함
+        value_render_option (str): 'UNFORMATTED_VALUE'(기본) 또는 'FORMATTED_VALUE'
+        request_rows (int): batchGet 요청 하나에 담는 최대 행 수
+
+    Returns:
+        우선순위가 가장 높은 scan 결과, 없으면 None
+    """
+    requests = _pack_windows(windows, request_rows)
+    if not requests:
+        return None
+
+    executor = get_read_executor()
+    futures = {
+        executor.submit(_scan_window_request, spreadsheet_id, request, columns, scan, value_render_option): order
+        for order, request in enumerate(requests)
+    }
+
+    results = {}
+    best = None
+    try:
+        for future in as_completed(futures):
+            order = futures[future]
+            results[order] = future.result()
+
+            if results[order] is not None and (best is None or order < best):
+                best = order
+
+            # 앞선 요청이 모두 끝났으면 결과 확정
+            if best is not None and all(prior in results for prior in range(best)):
+                return results[best]
+
+        return None
+    finally:
+        for future in futures:
+            future.cancel()
+
+
+# ============================================================
+# Sheets API 회로 차단기, stale-while-revalidate
+# ============================================================
+
+# 연속 실패(오류 또는 지연 예산 초과) 횟수 - 이 횟수가 되면 회로를 열어 API 호출을 건너뜀
+CIRCUIT_FAILURE_THRESHOLD = int(os.environ.get('CIRCUIT_FAILURE_THRESHOLD', 5))
+
+# 호출 하나의 지연 예산 (초) - 이보다 오래 걸린 호출은 성공해도 실패로 집계
+CIRCUIT_LATENCY_BUDGET = float(os.environ.get('CIRCUIT_LATENCY_BUDGET', 5.0))
+
+# 회로를 연 뒤 시험 호출을 허용하기까지 기다리는 시간 (초)
+CIRCUIT_RESET_TIMEOUT = float(os.environ.get('CIRCUIT_RESET_TIMEOUT', 30.0))
+
+# 유효 시간이 지난 캐시를 바로 응답하고 백그라운드에서 새로 고치는 최대 기간 (초)
+# 이보다 오래되었으면 동기로 새로 고침 (실패하거나 회로가 열려 있으면 오래된 값으로 응답)
+STALE_MAX_AGE = int(os.environ.get('STALE_MAX_AGE', 3600))
+
+
+class CircuitOpenError(Exception):
+    """회로 차단기가 열려 Google Sheets API 호출을 건너뛴 경우"""
+
+
+def is_upstream_failure(error):
+    """
+    Google Sheets 쪽 장애로 볼 오류인지 확인
+    429, 5xx, 네트워크 오류, 회로 차단은 장애 / 400, 403, 404 등 요청 오류는 장애가 아님
+
+    Args:
+        error (Exception): API 호출 중 발생한 오류
+
+    Returns:
+        bool: 장애이면 True
+    """
+    status = getattr(getattr(error, 'resp', None), 'status', None)
+    if status is None:
+        return True
+    return int(status) == 429 or int(status) >= 500
+
+
+class CircuitBreaker:
+    """
+    회로 차단기 (closed → open → half-open → closed)
+
+    - closed: 모든 호출 허용, 연속 실패가 failure_threshold에 도달하면 open
+    - open: 호출하지 않고 바로 CircuitOpenError, reset_timeout이 지나면 half-open
+    - half-open: 시험 호출 1건만 허용, 성공하면 closed / 실패하면 다시 open
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, name, failure_threshold=CIRCUIT_FAILURE_THRESHOLD,
+                 latency_budget=CIRCUIT_LATENCY_BUDGET, reset_timeout=CIRCUIT_RESET_TIMEOUT):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.latency_budget = latency_budget
+        self.reset_timeout = reset_timeout
+
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    def _current_state(self):
+        # 열린 지 reset_timeout이 지났으면 half-open으로 전환 (락 안에서 호출)
+        if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+            self._state = self.HALF_OPEN
+            self._probe_in_flight = False
+        return self._state
+
+    def is_open(self):
+        """지금 호출하면 차단되는지 확인 (half-open에서 시험 호출이 진행 중인 경우 포함)"""
+        with self._lock:
+            state = self._current_state()
+            return state == self.OPEN or (state == self.HALF_OPEN and self._probe_in_flight)
+
+    def call(self, func, *args, check_latency=True, **kwargs):
+        """
+        회로 상태를 확인하고 func 호출, 결과(오류, 소요 시간)를 집계
+
+        Args:
+            func (callable): 호출할 함수
+            check_latency (bool): False면 지연 예산을 적용하지 않고 오류만 집계 (검색 조회가 아닌 호출)
+
+        Returns:
+            func 반환값
+
+        Raises:
+            CircuitOpenError: 회로가 열려 호출하지 않은 경우
+        """
+        with self._lock:
+            state = self._current_state()
+            if state == self.OPEN or (state == self.HALF_OPEN and self._probe_in_flight):
+                raise CircuitOpenError(
+                    f"Google Sheets API 장애로 잠시 호출을 중단했습니다 ({self.name}, {self.reset_timeout:g}초 후 재시도)"
+                )
+            if state == self.HALF_OPEN:
+                self._probe_in_flight = True
+
+        started = time.perf_counter()
+        try:
+            result = func(*args, **kwargs)
+        except Exception as e:
+            if is_upstream_failure(e):
+                self._record_failure(type(e).__name__)
+            else:
+                # 요청 오류는 API가 정상적으로 응답한 것
+                self._record_success()
+            raise
+
+        elapsed = time.perf_counter() - started
+        if check_latency and elapsed > self.latency_budget:
+            self._record_failure('latency_budget_exceeded')
+        else:
+            self._record_success()
+        return result
+
+    def _record_success(self):
+        with self._lock:
+            if self._state != self.CLOSED:
+                get_logger('sheets-api').info('circuit_closed', circuit=self.name)
+            self._state = self.CLOSED
+            self._failures = 0
+            self._probe_in_flight = False
+
+    def _record_failure(self, reason):
+        with self._lock:
+            self._failures += 1
+            self._probe_in_flight = False
+            if self._state == self.OPEN:
+                return
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+                get_logger('sheets-api').warning('circuit_opened', circuit=self.name, reason=reason,
+                                                 consecutive_failures=self._failures)
+
+    def status(self):
+        """
+        회로 상태 조회
+
+        Returns:
+            dict: 상태, 연속 실패 횟수, 열린 뒤 경과 시간 (초)
+        """
+        with self._lock:
+            state = self._current_state()
+            return {
+                'state': state,
+                'consecutive_failures': self._failures,
+                'open_seconds': round(time.monotonic() - self._opened_at, 1) if state != self.CLOSED else 0
+            }
+
+
+# Google Sheets API 회로 차단기 (프로세스 전체에서 공유)
+sheets_breaker = CircuitBreaker('sheets')
+
+
+# 검색 경로의 짧은 조회 구간인지 (스레드별)
+_search_read_state = threading.local()
+
+
+@contextmanager
+def search_read():
+    """
+    검색 경로의 짧은 조회 구간 (인덱스로 찾은 행 읽기, 행 구간 병렬 검색)
+    이 구간의 호출만 지연 예산을 넘으면 실패로 집계
+    (전체 탭 읽기, 쓰기, 인덱스/보관 파일 생성처럼 원래 오래 걸리는 호출은 오류만 집계해 검색을 차단하지 않음)
+    """
+    previous = getattr(_search_read_state, 'active', False)
+    _search_read_state.active = True
+    try:
+        yield
+    finally:
+        _search_read_state.active = previous
+
+
+def in_search_read():
+    """현재 스레드가 검색 경로의 짧은 조회 구간인지 확인"""
+    return getattr(_search_read_state, 'active', False)
+
+
+class _GuardedHttpRequest(HttpRequest):
+    """회로 차단기를 거쳐 실행되는 API 요청 (get_sheets_service의 requestBuilder)"""
+
+    def execute(self, http=None, num_retries=0):
+        return sheets_breaker.call(super().execute, http=http, num_retries=num_retries,
+                                   check_latency=in_search_read())
+
+
+# 이번 요청에서 오래된 캐시로 응답했는지 (요청 스레드별)
+_stale_state = threading.local()
+
+
+def begin_stale_tracking():
+    """요청 시작 시 호출 - 오래된 캐시 사용 여부 초기화"""
+    _stale_state.served = False
+
+
+def mark_stale():
+    """이번 요청이 오래된 캐시 값을 사용했음을 기록"""
+    _stale_state.served = True
+
+
+def served_stale():
+    """이번 요청이 오래된 캐시 값을 사용했으면 True"""
+    return getattr(_stale_state, 'served', False)
+
+
+# 백그라운드에서 새로 고치고 있는 캐시 {(캐시 종류, 스프레드시트 ID)}
+_refreshes_in_flight = set()
+_refreshes_lock = threading.Lock()
+
+
+def refresh_in_background(kind, spreadsheet_id, refresh):
+    """
+    캐시를 백그라운드 스레드에서 새로 고침 (같은 캐시를 이미 새로 고치고 있으면 무시)
+
+    Args:
+        kind (str): 캐시 종류 (예: 'metadata', 'phone_index')
+        spreadsheet_id: 스프레드시트 ID
+        refresh (callable): refresh(sheets_service) → 새 값 (캐시 저장까지 수행)
+    """
+    key = (kind, spreadsheet_id)
+    with _refreshes_lock:
+        if key in _refreshes_in_flight:
+            return
+        _refreshes_in_flight.add(key)
+
+    def run():
+        try:
+            # 백그라운드 스레드의 API 클라이언트 사용
+            refresh(get_sheets_service())
+        except Exception as e:
+            get_logger('sheets-api').warning('cache_refresh_failed', cache=kind, spreadsheet=spreadsheet_id[:10],
+                                             error_type=type(e).__name__, error=str(e))
+        finally:
+            with _refreshes_lock:
+                _refreshes_in_flight.discard(key)
+
+    threading.Thread(target=run, name=f'{kind}-refresh', daemon=True).start()
+
+
+def get_with_revalidate(kind, spreadsheet_id, cached, max_age, refresh, sheets_service, stale_ok=True):
+    """
+    stale-while-revalidate 캐시 조회
+
+    - max_age 이내: 캐시 값 반환
+    - max_age + STALE_MAX_AGE 이내 (stale_ok) 또는 회로가 열려 있음: 캐시 값을 바로 반환, 새로 고침은 백그라운드
+    - 그 밖: 동기로 새로 고침, 실패하면 캐시 값 반환
+    캐시 값을 오래된 채로 반환하면 mark_stale() 호출 (응답에 'stale': true 표시)
+
+    Args:
+        kind (str): 캐시 종류
+        spreadsheet_id: 스프레드시트 ID
+        cached (tuple): (캐시 값, 경과 시간(초)), 캐시가 없으면 None
+        max_age (float): 캐시 유효 시간 (초)
+        refresh (callable): refresh(sheets_service) → 새 값 (캐시 저장까지 수행)
+        sheets_service: 동기로 새로 고칠 때 사용할 API 서비스 객체
+        stale_ok (bool): False면 STALE_MAX_AGE 이내라도 동기로 새로 고침
+
+    Returns:
+        캐시 값 또는 새로 고친 값
+
+    Raises:
+        CircuitOpenError 등: 캐시가 없는데 새로 고침에 실패한 경우
+    """
+    if cached is not None:
+        value, age = cached
+        if age < max_age:
+            return value
+
+        circuit_open = sheets_breaker.is_open()
+        if circuit_open or (stale_ok and age < max_age + STALE_MAX_AGE):
+            # 회로가 열려 있으면 새로 고침도 차단되므로 시험 호출이 가능해질 때까지 기다림
+            if not circuit_open:
+                refresh_in_background(kind, spreadsheet_id, refresh)
+            mark_stale()
+            return value
+
+    try:
+        return refresh(sheets_service)
+    except Exception as e:
+        if cached is None or not is_upstream_failure(e):
+            raise
+        get_logger('sheets-api').warning('stale_served', cache=kind, spreadsheet=spreadsheet_id[:10],
+                                         age_seconds=round(cached[1], 1), error_type=type(e).__name__)
+        mark_stale()
+        return cached[0]
+
+
+# ============================================================
+# 구조화 로깅
+# ============================================================
+
+# 로그 레벨 (LOG_LEVEL 환경 변수로 최소 레벨 지정, 기본 INFO)
+LOG_LEVELS = {'DEBUG': 10, 'INFO': 20, 'WARNING': 30, 'ERROR': 40}
+
+# 값이 전화번호인 로그 필드 - 출력 시 가운데 자리를 마스킹
+PII_PHONE_FIELDS = {'phone', 'phone_number', 'phone_normalized', 'mobile_number'}
+
+# 값 자체를 남기지 않는 로그 필드 - 출력 시 길이만 남김
+PII_REDACTED_FIELDS = {'name', 'product_list', 'request', 'data'}
+
+
+def mask_phone(phone):
+    """
+    로그 출력용 전화번호 마스킹 (가운데 자리를 *로 가림)
+
+    변환 예시:
+    - 010-5217-0838 → 010-****-0838
+    - +82 10-5217-0838 → 010-****-0838
+    - 0838 → ****
+
+    Args:
+        phone (str): 원본 전화번호
+
+    Returns:
+        str: 마스킹된 전화번호
+    """
+    if not phone:
+        return ""
+
+    normalized = normalize_phone(phone)
+    parts = normalized.split('-')
+    if len(parts) == 3:
+        return f"{parts[0]}-{'*' * len(parts[1])}-{parts[2]}"
+
+    # 형식이 맞지 않으면 끝 4자리만 남김
+    if len(normalized) <= 4:
+        return '*' * len(normalized)
+    return '*' * (len(normalized) - 4) + normalized[-4:]
+
+
+def _parse_sample_rates(value):
+    """
+    LOG_SAMPLE_RATES 환경 변수 파싱
+    예: "sheets-search-phone=0.1,sheets-read=0.5" → {'sheets-search-phone': 0.1, 'sheets-read': 0.5}
+    """
+    rates = {}
+    for item in (value or '').split(','):
+        if '=' not in item:
+            continue
+        endpoint, rate = item.split('=', 1)
+        try:
+            rates[endpoint.strip()] = min(max(float(rate), 0.0), 1.0)
+        except ValueError:
+            continue
+    return rates
+
+
+def _format_log_record(record):
+    """로그 레코드를 JSON 한 줄로 변환 (PII 필드 마스킹 포함)"""
+    timestamp, level, endpoint, event, fields = record
+
+    entry = {
+        'ts': datetime.fromtimestamp(timestamp, tz=timezone.utc).isoformat(timespec='milliseconds'),
+        'level': level,
+        'endpoint': endpoint,
+        'event': event
+    }
+    for key, value in fields.items():
+        if key in PII_PHONE_FIELDS:
+            value = mask_phone(value)
+        elif key in PII_REDACTED_FIELDS:
+            value = f"<{len(str(value))} chars>" if value else ''
+        entry[key] = value
+
+    return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class _LogWriter:
+    """
+    로그 레코드를 큐로 받아 백그라운드 스레드에서 출력
+    요청 처리 스레드는 큐에 넣기만 하므로 stdout 쓰기를 기다리지 않음
+    (JSONRequestHandler는 응답을 보낸 뒤 flush로 이번 요청의 로그가 출력될 때까지 기다림)
+    """
+
+    def __init__(self):
+        self._queue = queue.SimpleQueue()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def submit(self, record):
+        """로그 레코드를 큐에 추가 (첫 호출 시 출력 스레드 시작)"""
+        if self._thread is None:
+            self._start()
+        self._queue.put(record)
+
+    def flush(self, timeout=1.0):
+        """
+        큐에 쌓인 로그가 모두 출력될 때까지 대기 (프로세스 종료 직전 사용)
+
+        Args:
+            timeout (float): 최대 대기 시간 (초)
+        """
+        if self._thread is None:
+            return
+        done = threading.Event()
+        self._queue.put(done)
+        done.wait(timeout)
+
+    def _start(self):
+        with self._lock:
+            if self._thread is None:
+                thread = threading.Thread(target=self._run, name='sheets-log-writer', daemon=True)
+                thread.start()
+                self._thread = thread
+
+    def _run(self):
+        while True:
+            items = [self._queue.get()]
+            # 쌓여 있는 레코드는 한 번의 write로 묶어서 출력
+            while True:
+                try:
+                    items.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            lines = []
+            markers = []
+            for item in items:
+                if isinstance(item, threading.Event):
+                    markers.append(item)
+                    continue
+                try:
+                    lines.append(_format_log_record(item))
+                except Exception as e:
+                    lines.append(json.dumps({'level': 'ERROR', 'event': 'log_format_failed', 'error': str(e)}))
+
+            if lines:
+                try:
+                    sys.stdout.write('\n'.join(lines) + '\n')
+                    sys.stdout.flush()
+                except Exception:
+                    pass
+
+            for marker in markers:
+                marker.set()
+
+
+_LOG_WRITER = _LogWriter()
+atexit.register(_LOG_WRITER.flush)
+
+
+class StructuredLogger:
+    """
+    엔드포인트별 구조화 로거
+
+    - LOG_LEVEL 미만 레벨은 레코드를 만들지 않고 바로 반환
+    - DEBUG/INFO 로그는 요청 단위로 샘플링 (begin_request 호출 시 결정)
+    - WARNING/ERROR 로그는 샘플링과 무관하게 항상 출력
+    - 전화번호 등 PII 필드는 출력 스레드에서 마스킹
+    """
+
+    def __init__(self, endpoint, level=None, sample_rate=None):
+        self.endpoint = endpoint
+
+        level_name = (level or os.environ.get('LOG_LEVEL', 'INFO')).upper()
+        self.level = LOG_LEVELS.get(level_name, LOG_LEVELS['INFO'])
+
+        if sample_rate is None:
+            rates = _parse_sample_rates(os.environ.get('LOG_SAMPLE_RATES', ''))
+            sample_rate = rates.get(endpoint, rates.get('*', 1.0))
+        self.sample_rate = sample_rate
+
+        self._local = threading.local()
+
+    def begin_request(self):
+        """
+        요청 시작 시 호출 - 이번 요청의 DEBUG/INFO 로그 출력 여부를 샘플링으로 결정
+
+        Returns:
+            bool: 이번 요청이 샘플링되었으면 True
+        """
+        sampled = self.sample_rate >= 1.0 or random.random() < self.sample_rate
+        self._local.sampled = sampled
+        return sampled
+
+    def log(self, level, event, **fields):
+        """
+        로그 레코드 추가
+
+        Args:
+            level (str): 'DEBUG', 'INFO', 'WARNING', 'ERROR'
+            event (str): 이벤트 이름 (예: 'search_result')
+            **fields: 함께 남길 필드
+        """
+        levelno = LOG_LEVELS[level]
+        if levelno < self.level:
+            return
+        if levelno < LOG_LEVELS['WARNING'] and not getattr(self._local, 'sampled', True):
+            return
+        _LOG_WRITER.submit((time.time(), level, self.endpoint, event, fields))
+
+    def debug(self, event, **fields):
+        self.log('DEBUG', event, **fields)
+
+    def info(self, event, **fields):
+        self.log('INFO', event, **fields)
+
+    def warning(self, event, **fields):
+        self.log('WARNING', event, **fields)
+
+    def error(self, event, **fields):
+        self.log('ERROR', event, **fields)
+
+
+_loggers = {}
+
+
+def get_logger(endpoint):
+    """
+    엔드포인트 이름으로 구조화 로거 가져오기 (엔드포인트별로 하나만 생성)
+
+    Args:
+        endpoint (str): 엔드포인트 이름 (예: 'sheets-search-phone')
+
+    Returns:
+        StructuredLogger: 로거 객체
+    """
+    logger = _loggers.get(endpoint)
+    if logger is None:
+        logger = _loggers.setdefault(endpoint, StructuredLogger(endpoint))
+    return logger
+
+
+def flush_logs(timeout=1.0):
+    """큐에 쌓인 로그를 모두 출력 (프로세스 종료 직전 사용)"""
+    _LOG_WRITER.flush(timeout)
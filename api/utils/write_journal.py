@@ -0,0 +1,396 @@
+"""
+sheets-write 지연 쓰기(write-behind) 저널
+- 요청 행을 로컬 SQLite(WAL) 저널에 먼저 기록하고 바로 응답
+- 백그라운드 플러셔가 (문서, 시트)별로 대기 행을 모아 한 번의 append로 기록
+- 같은 (문서, 시트)의 행은 저널에 기록된 순서대로 추가
+  (배치가 실패하면 재시도에 성공할 때까지 뒤에 들어온 행도 대기)
+- append 성공 후 저널 갱신 전에 프로세스가 죽으면 해당 배치는 다시 추가될 수 있음 (at-least-once)
+- Sheets 장애(429, 5xx, 네트워크)는 재시도, 요청 오류(삭제된 시트 등 400/403/404)는 재시도하지 않고 dead 상태로 보관
+- 재시작 후에도 남는 영구 저장소 경로(WRITE_JOURNAL_PATH)를 지정한 경우에만 사용
+  (Vercel의 /tmp는 인스턴스가 교체되면 사라지고, 인스턴스마다 저널이 따로 있음)
+"""
+
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+
+from .sheets_common import quote_sheet_name, is_upstream_failure
+
+
+# 저널 파일 경로 (영구 저장소, 없으면 지연 쓰기 사용 안 함)
+JOURNAL_PATH = os.environ.get('WRITE_JOURNAL_PATH', '')
+
+# 한 번의 append로 보낼 최대 행 수
+MAX_BATCH_ROWS = 500
+
+# 백그라운드 플러시 간격 (초) - 이 시간 동안 들어온 행을 모아서 기록
+FLUSH_INTERVAL = float(os.environ.get('WRITE_FLUSH_INTERVAL', 2.0))
+
+# 새 행이 없을 때 재시도 대상 배치를 확인하는 간격 (초)
+IDLE_CHECK_INTERVAL = 30.0
+
+# 실패한 배치 재시도 대기 시간 (초, 실패할 때마다 2배, 최대 RETRY_MAX_DELAY)
+RETRY_BASE_DELAY = 2.0
+RETRY_MAX_DELAY = 300.0
+
+# 기록 완료된 행 보관 기간 (초)
+DONE_RETENTION = 24 * 60 * 60
+
+# 저널 상태 조회 시 보여줄 최근 dead 행 수
+DEAD_SAMPLE_ROWS = 20
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS journal (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    spreadsheet_id TEXT NOT NULL,
+    sheet_name TEXT NOT NULL,
+    row_json TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    created_at REAL NOT NULL,
+    flushed_at REAL,
+    updated_range TEXT,
+    last_error TEXT
+);
+CREATE INDEX IF NOT EXISTS journal_pending
+    ON journal (status, spreadsheet_id, sheet_name, id);
+CREATE TABLE IF NOT EXISTS journal_keys (
+    spreadsheet_id TEXT NOT NULL,
+    sheet_name TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    last_error TEXT,
+    next_attempt_at REAL NOT NULL DEFAULT 0,
+    PRIMARY KEY (spreadsheet_id, sheet_name)
+);
+"""
+
+
+def journal_is_persistent(path=JOURNAL_PATH):
+    """
+    저널 경로가 재시작 후에도 남는 저장소인지 확인 (지정되지 않았거나 임시 폴더이면 False)
+
+    Args:
+        path (str): 저널 파일 경로
+
+    Returns:
+        bool: 지연 쓰기에 사용할 수 있으면 True
+    """
+    if not path:
+        return False
+    real_path = os.path.realpath(path)
+    for temp_dir in {os.path.realpath(tempfile.gettempdir()), '/tmp'}:
+        if real_path == temp_dir or real_path.startswith(temp_dir.rstrip(os.sep) + os.sep):
+            return False
+    return True
+
+
+class WriteJournal:
+    """
+    SQLite WAL 기반 쓰기 저널
+
+    하나의 연결을 락으로 보호해 여러 스레드에서 사용
+    """
+
+    def __init__(self, path=JOURNAL_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        # 같은 행이 동시에 두 번 append되지 않도록 플러시는 한 번에 하나만 실행
+        self._flush_lock = threading.Lock()
+
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=FULL')
+        self._conn.executescript(_SCHEMA)
+
+    def enqueue(self, spreadsheet_id, sheet_name, row_values):
+        """
+        행을 저널에 기록 (커밋 후 반환)
+
+        Args:
+            spreadsheet_id: 스프레드시트 ID
+            sheet_name: 시트 이름
+            row_values (list): 추가할 행 값
+
+        Returns:
+            int: 저널 ID
+        """
+        with self._lock:
+            cursor = self._conn.execute(
+                'INSERT INTO journal (spreadsheet_id, sheet_name, row_json, created_at) VALUES (?, ?, ?, ?)',
+                (spreadsheet_id, sheet_name, json.dumps(row_values, ensure_ascii=False), time.time())
+            )
+            return cursor.lastrowid
+
+    def flush(self, sheets_service, max_rows=MAX_BATCH_ROWS):
+        """
+        대기 중인 행을 (문서, 시트)별로 모아 append
+
+        Args:
+            sheets_service: Google Sheets API 서비스 객체
+            max_rows (int): 배치당 최대 행 수
+
+        Returns:
+            dict: {'batches': 배치 수, 'flushed_rows': 기록한 행 수, 'failed_batches': 재시도할 배치 수,
+                   'dead_rows': 요청 오류로 재시도하지 않는 행 수}
+        """
+        summary = {'batches': 0, 'flushed_rows': 0, 'failed_batches': 0, 'dead_rows': 0}
+
+        with self._flush_lock:
+            for spreadsheet_id, sheet_name in self._ready_keys():
+                while True:
+                    rows = self._pending_rows(spreadsheet_id, sheet_name, max_rows)
+                    if not rows:
+                        break
+
+                    summary['batches'] += 1
+                    try:
+                        result = sheets_service.spreadsheets().values().append(
+                            spreadsheetId=spreadsheet_id,
+                            range=f'{quote_sheet_name(sheet_name)}!A:Z',
+                            valueInputOption='USER_ENTERED',
+                            insertDataOption='INSERT_ROWS',
+                            body={'values': [json.loads(row_json) for _, row_json in rows]}
+                        ).execute()
+                    except Exception as e:
+                        if is_upstream_failure(e):
+                            self._mark_failed(spreadsheet_id, sheet_name, e)
+                            summary['failed_batches'] += 1
+                            break
+                        # 요청 오류(삭제된 시트 등)는 재시도해도 실패하므로 dead로 옮기고 다음 행 계속
+                        self._mark_dead(spreadsheet_id, sheet_name, [row_id for row_id, _ in rows], e)
+                        summary['dead_rows'] += len(rows)
+                        continue
+
+                    updated_range = result.get('updates', {}).get('updatedRange', '')
+                    self._mark_done(spreadsheet_id, sheet_name, [row_id for row_id, _ in rows], updated_range)
+                    summary['flushed_rows'] += len(rows)
+
+                    if len(rows) < max_rows:
+                        break
+
+            self._prune_done()
+
+        return summary
+
+    def reset_retry_delays(self):
+        """재시도 대기 시간 초기화 (재시작 후 이전 프로세스의 백오프를 기다리지 않고 바로 기록)"""
+        with self._lock:
+            self._conn.execute('UPDATE journal_keys SET next_attempt_at = 0')
+
+    def pending_count(self):
+        """대기 중인 행 수"""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM journal WHERE status = 'pending'"
+            ).fetchone()[0]
+
+    def status(self):
+        """
+        저널 상태 조회
+
+        Returns:
+            dict: 대기/완료/dead 행 수, 가장 오래된 대기 행의 경과 시간, (문서, 시트)별 대기 현황, 최근 dead 행
+        """
+        with self._lock:
+            counts = dict(self._conn.execute(
+                'SELECT status, COUNT(*) FROM journal GROUP BY status'
+            ).fetchall())
+            oldest = self._conn.execute(
+                "SELECT MIN(created_at) FROM journal WHERE status = 'pending'"
+            ).fetchone()[0]
+            key_rows = self._conn.execute(
+                """
+                SELECT j.spreadsheet_id, j.sheet_name, COUNT(*),
+                       COALESCE(k.attempts, 0), k.last_error, COALESCE(k.next_attempt_at, 0)
+                FROM journal j
+                LEFT JOIN journal_keys k
+                    ON k.spreadsheet_id = j.spreadsheet_id AND k.sheet_name = j.sheet_name
+                WHERE j.status = 'pending'
+                GROUP BY j.spreadsheet_id, j.sheet_name
+                """
+            ).fetchall()
+            dead_rows = self._conn.execute(
+                """
+                SELECT id, spreadsheet_id, sheet_name, last_error FROM journal
+                WHERE status = 'dead' ORDER BY id DESC LIMIT ?
+                """,
+                (DEAD_SAMPLE_ROWS,)
+            ).fetchall()
+
+        now = time.time()
+        return {
+            'pending_rows': counts.get('pending', 0),
+            'done_rows': counts.get('done', 0),
+            'dead_rows': counts.get('dead', 0),
+            'oldest_pending_seconds': round(now - oldest, 1) if oldest else 0,
+            'keys': [
+                {
+                    'sheet_id': spreadsheet_id,
+                    'sheet_name': sheet_name,
+                    'pending_rows': pending,
+                    'attempts': attempts,
+                    'last_error': last_error or '',
+                    'retry_in_seconds': round(max(next_attempt_at - now, 0), 1)
+                }
+                for spreadsheet_id, sheet_name, pending, attempts, last_error, next_attempt_at in key_rows
+            ],
+            'dead': [
+                {'journal_id': row_id, 'sheet_id': spreadsheet_id, 'sheet_name': sheet_name, 'error': last_error}
+                for row_id, spreadsheet_id, sheet_name, last_error in dead_rows
+            ]
+        }
+
+    def _ready_keys(self):
+        """재시도 대기 중이 아닌 (문서, 시트) 목록 - 가장 먼저 들어온 행 순서"""
+        with self._lock:
+            return self._conn.execute(
+                """
+                SELECT j.spreadsheet_id, j.sheet_name
+                FROM journal j
+                LEFT JOIN journal_keys k
+                    ON k.spreadsheet_id = j.spreadsheet_id AND k.sheet_name = j.sheet_name
+                WHERE j.status = 'pending' AND COALESCE(k.next_attempt_at, 0) <= ?
+                GROUP BY j.spreadsheet_id, j.sheet_name
+                ORDER BY MIN(j.id)
+                """,
+                (time.time(),)
+            ).fetchall()
+
+    def _pending_rows(self, spreadsheet_id, sheet_name, limit):
+        with self._lock:
+            return self._conn.execute(
+                """
+                SELECT id, row_json FROM journal
+                WHERE status = 'pending' AND spreadsheet_id = ? AND sheet_name = ?
+                ORDER BY id LIMIT ?
+                """,
+                (spreadsheet_id, sheet_name, limit)
+            ).fetchall()
+
+    def _mark_done(self, spreadsheet_id, sheet_name, row_ids, updated_range):
+        now = time.time()
+        with self._lock:
+            self._conn.execute('BEGIN IMMEDIATE')
+            try:
+                self._conn.executemany(
+                    "UPDATE journal SET status = 'done', flushed_at = ?, updated_range = ? WHERE id = ?",
+                    [(now, updated_range, row_id) for row_id in row_ids]
+                )
+                self._conn.execute(
+                    'DELETE FROM journal_keys WHERE spreadsheet_id = ? AND sheet_name = ?',
+                    (spreadsheet_id, sheet_name)
+                )
+                self._conn.execute('COMMIT')
+            except Exception:
+                self._conn.execute('ROLLBACK')
+                raise
+
+    def _mark_failed(self, spreadsheet_id, sheet_name, error):
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT attempts FROM journal_keys WHERE spreadsheet_id = ? AND sheet_name = ?',
+                (spreadsheet_id, sheet_name)
+            ).fetchone()
+            attempts = (row[0] if row else 0) + 1
+            delay = min(RETRY_BASE_DELAY * (2 ** (attempts - 1)), RETRY_MAX_DELAY)
+            self._conn.execute(
+                """
+                INSERT OR REPLACE INTO journal_keys
+                    (spreadsheet_id, sheet_name, attempts, last_error, next_attempt_at)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                (spreadsheet_id, sheet_name, attempts, f'{type(error).__name__}: {error}', time.time() + delay)
+            )
+
+    def _mark_dead(self, spreadsheet_id, sheet_name, row_ids, error):
+        """재시도하지 않을 행을 dead 상태로 보관 (저널에서 삭제하지 않음, status로 확인)"""
+        message = f'{type(error).__name__}: {error}'
+        with self._lock:
+            self._conn.execute('BEGIN IMMEDIATE')
+            try:
+                self._conn.executemany(
+                    "UPDATE journal SET status = 'dead', last_error = ? WHERE id = ?",
+                    [(message, row_id) for row_id in row_ids]
+                )
+                self._conn.execute(
+                    'DELETE FROM journal_keys WHERE spreadsheet_id = ? AND sheet_name = ?',
+                    (spreadsheet_id, sheet_name)
+                )
+                self._conn.execute('COMMIT')
+            except Exception:
+                self._conn.execute('ROLLBACK')
+                raise
+
+    def _prune_done(self):
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM journal WHERE status = 'done' AND flushed_at < ?",
+                (time.time() - DONE_RETENTION,)
+            )
+
+
+class WriteBehindFlusher:
+    """
+    저널을 주기적으로 플러시하는 백그라운드 스레드
+
+    notify()로 깨우면 FLUSH_INTERVAL 동안 더 들어오는 행을 모은 뒤 한 번에 기록
+    """
+
+    def __init__(self, journal, service_factory, interval=FLUSH_INTERVAL, logger=None):
+        self.journal = journal
+        self.service_factory = service_factory
+        self.interval = interval
+        self.logger = logger
+
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        """플러셔 스레드 시작 (이미 실행 중이면 무시)"""
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._stopping.clear()
+                self._thread = threading.Thread(target=self._run, name='sheets-write-flusher', daemon=True)
+                self._thread.start()
+
+    def notify(self):
+        """새 행이 기록되었음을 알림"""
+        self._wakeup.set()
+
+    def stop(self, timeout=10.0):
+        """
+        플러셔 종료 - 마지막으로 한 번 더 플러시한 뒤 종료
+
+        Args:
+            timeout (float): 최대 대기 시간 (초)
+        """
+        self._stopping.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _run(self):
+        while not self._stopping.is_set():
+            # 새 행이 들어오거나 재시도 시간이 되면 깨어남
+            self._wakeup.wait(IDLE_CHECK_INTERVAL)
+            self._wakeup.clear()
+            # 잠시 기다려 연속으로 들어오는 행을 한 배치로 모음
+            self._stopping.wait(self.interval)
+            self._flush_once()
+
+        self._flush_once()
+
+    def _flush_once(self):
+        try:
+            if self.journal.pending_count() == 0:
+                return
+            summary = self.journal.flush(self.service_factory())
+            if self.logger is not None:
+                self.logger.info('journal_flushed', **summary)
+        except Exception as e:
+            if self.logger is not None:
+                self.logger.error('journal_flush_failed', error_type=type(e).__name__, error=str(e))
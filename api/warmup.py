@@ -0,0 +1,45 @@
+"""
+검색 캐시 사전 준비(warm-up) API
+API 클라이언트, 시트 이름 목록, 전화번호 인덱스, 고객명 검색 인덱스를 미리 만들어 둠
+
+Vercel에서는 api/*.py 파일마다 별도 함수(인스턴스)이므로 이 함수를 호출해도 이 함수의 캐시만 준비됨
+- 검색 함수의 캐시는 vercel.json crons가 각 검색 API를 GET으로 호출해 준비
+  (sheets-search-phone, sheets-search-customer, sheets-search-and-record)
+- 이 API는 모든 핸들러가 캐시를 공유하는 자체 서버(local_server.py)나 수동 확인용
+- CRON_SECRET 환경 변수가 있으면 Authorization: Bearer <CRON_SECRET> 필요
+- 로컬: python api/warmup.py
+"""
+
+import json
+import sys
+import os
+
+# utils 모듈 경로 추가
+sys.path.append(os.path.dirname(__file__))
+from utils.sheets_common import get_logger, flush_logs
+from utils.http_common import JSONRequestHandler
+from utils.customer_index import warm_up_search_indexes
+
+logger = get_logger('warmup')
+
+
+def warm_up_all():
+    """전화번호 인덱스와 고객 인덱스 모두 준비 (문서별 한 번의 배치 읽기로 두 인덱스 생성)"""
+    return warm_up_search_indexes()
+
+
+class handler(JSONRequestHandler):
+    """Vercel Serverless Function Handler"""
+
+    logger = logger
+    allowed_methods = 'GET, POST, OPTIONS'
+    warm_up = staticmethod(warm_up_all)
+
+    def do_POST(self):
+        """POST 요청 처리 - 수동 호출 (요청 본문 없음)"""
+        self._dispatch(self.run_warm_up)
+
+
+if __name__ == '__main__':
+    print(json.dumps(warm_up_all(), ensure_ascii=False, indent=2))
+    flush_logs()
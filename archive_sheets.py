@@ -0,0 +1,58 @@
+"""
+마감된 시트(탭) 보관 파일 관리
+ARCHIVE_TAB_PATTERN / ARCHIVE_MIN_AGE_DAYS 규칙에 맞는 탭을 ARCHIVE_DIR에 압축 파일로 내보내고,
+보관 파일이 원본 탭과 같은지 확인
+
+- rebuild: 규칙에 맞는 탭을 다시 읽어 보관 파일 교체
+- check: 보관 파일과 원본 탭 비교 (다른 탭이 있으면 종료 코드 1)
+
+사용법:
+    python archive_sheets.py rebuild
+    python archive_sheets.py check --document capital
+"""
+
+import argparse
+import json
+import os
+import sys
+
+API_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'api')
+
+# utils 모듈 경로 추가
+sys.path.append(API_DIR)
+from utils.sheets_common import get_sheets_service, get_logger, flush_logs
+from utils.phone_search import SEARCH_DOCUMENTS
+from utils.sheet_archive import build_archive, check_archive
+
+logger = get_logger('archive-sheets')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='마감된 시트 보관 파일 재생성/일관성 검사')
+    parser.add_argument('command', choices=['rebuild', 'check'])
+    parser.add_argument('--document', choices=['all'] + [document for document, _ in SEARCH_DOCUMENTS],
+                        default='all', help='대상 문서 (기본: 전체)')
+    args = parser.parse_args(argv)
+
+    sheets_service = get_sheets_service()
+    results = {}
+    ok = True
+
+    for document, sheet_id in SEARCH_DOCUMENTS:
+        if args.document not in ('all', document):
+            continue
+
+        if args.command == 'rebuild':
+            results[document] = build_archive(sheets_service, sheet_id)
+        else:
+            results[document] = check_archive(sheets_service, sheet_id)
+            ok = ok and results[document]['ok']
+            logger.info('archive_checked', document=document, ok=results[document]['ok'])
+
+    print(json.dumps(results, ensure_ascii=False, indent=2))
+    flush_logs()
+    return 0 if ok else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
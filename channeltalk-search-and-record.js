@@ -0,0 +1,100 @@
+// 채널톡 코드 노드 - 전화번호 검색 + 문의인입 기록 (한 번의 API 호출)
+// 전화번호로 수도권/지방 문서를 검색하고, 찾은 시트명/처리날짜를 채워 '문의인입' 시트에 추가
+// channeltalk-search-phone.js + channeltalk-add-inquiry.js 두 노드를 대신합니다
+// 아래 코드를 채널톡 코드 노드에 복사해서 사용하세요
+
+const axios = require('axios');
+
+// API 설정
+const API_URL = 'https://channel-talk-sheets-api.vercel.app/api/sheets-search-and-record';
+
+// 고객 정보 가져오기
+const name = context.user?.name || '';
+const mobileNumber = context.user?.profile?.mobileNumber || '';
+
+// 메모리에서 change_date, request 가져오기
+const changeDate = memory.get('change_date') || '';
+const request = memory.get('request') || '';
+
+if (!mobileNumber) {
+  console.log('[경고] 전화번호가 없습니다');
+  memory.put('action_date', '전화번호가 없습니다');
+  memory.put('product_list', '');
+  memory.put('sheet_name', '');
+  memory.put('success_fail', '실패');
+  memory.save();
+  return;
+}
+
+console.log('[검색+기록] 요청 준비');
+console.log(`   이름: ${name}`);
+console.log(`   전화번호: ${mobileNumber}`);
+console.log(`   변경원하는일정: ${changeDate}`);
+console.log(`   요청사항: ${request}`);
+
+// API 호출
+try {
+  const response = await axios.post(
+    API_URL,
+    {
+      phone_number: mobileNumber,
+      name: name,
+      change_date: changeDate,
+      request: request
+    },
+    {
+      timeout: 30000
+    }
+  );
+
+  console.log('[성공] API 응답:', JSON.stringify(response.data));
+
+  // 검색 결과 저장
+  const search = response.data.search || {};
+  memory.put('action_date', search.found ? (search.action_date || '') : '');
+  memory.put('product_list', search.found ? (search.product_list || '') : '');
+  memory.put('sheet_name', search.found ? (search.sheet_name || '') : '');
+
+  if (search.found) {
+    console.log(`[성공] 고객 정보 찾음! 시트: ${search.sheet_name}, 행: ${search.row}`);
+  } else {
+    console.log('[실패] 고객 정보를 찾을 수 없습니다');
+  }
+
+  // 문의인입 기록 결과 저장
+  const inquiry = response.data.inquiry || {};
+  if (inquiry.status === 'success') {
+    console.log(`[성공] 문의인입 기록 완료! 추가된 행: ${inquiry.row}`);
+    memory.put('success_fail', '성공');
+  } else {
+    console.log('[실패] 문의인입 기록 실패:', inquiry.message);
+    memory.put('success_fail', '실패');
+    memory.put('error_message', inquiry.message || '');
+  }
+
+  memory.save();
+
+} catch (error) {
+  console.log('[오류] API 호출 실패:', error.message);
+
+  memory.put('action_date', 'API 호출 실패');
+  memory.put('product_list', '');
+  memory.put('sheet_name', '');
+  memory.put('success_fail', '실패');
+
+  if (error.response) {
+    console.log('   상태 코드:', error.response.status);
+    console.log('   오류 내용:', JSON.stringify(error.response.data));
+
+    memory.put('error_status', error.response.status);
+    memory.put('error_message', JSON.stringify(error.response.data));
+  } else if (error.request) {
+    console.log('   요청은 보냈으나 응답 없음');
+
+    memory.put('error_message', '서버 응답 없음 - Vercel 배포 확인 필요');
+  } else {
+    memory.put('error_message', error.message);
+  }
+
+  memory.save();
+}
@@ -0,0 +1,299 @@
+"""
+자체 서버 실행 모드
+api/*.py의 Vercel 핸들러를 하나의 상주 프로세스에 모두 올려 /api/<파일 이름> 경로로 제공
+
+- 요청은 고정 크기 워커 풀에서 처리하고, 워커와 대기열이 모두 차면 바로 503 응답
+- API 클라이언트, 메타데이터/전화번호/고객 인덱스 캐시는 프로세스 안에서 모든 요청이 공유
+- GET /healthz: 로드밸런서 상태 확인 (종료 중에는 503)
+- SIGTERM/SIGINT: 새 연결을 받지 않고 처리 중인 요청을 마친 뒤
+  지연 쓰기 저널을 플러시하고 로그를 모두 출력한 후 종료
+
+사용법:
+    python local_server.py --port 8000 --workers 8 --warm-up
+"""
+
+import argparse
+import importlib.util
+import os
+import signal
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import HTTPServer
+from urllib.parse import urlsplit
+
+API_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'api')
+
+# utils 모듈 경로 추가 (핸들러와 같은 utils 모듈을 공유)
+sys.path.append(API_DIR)
+from utils.sheets_common import get_logger, flush_logs, sheets_breaker
+from utils.http_common import JSONRequestHandler, dumps_json
+
+# 요청을 처리하는 워커 스레드 수
+SERVER_WORKERS = int(os.environ.get('SERVER_WORKERS', 8))
+
+# 워커가 모두 사용 중일 때 대기할 수 있는 요청 수 (초과 시 503)
+SERVER_QUEUE_SIZE = int(os.environ.get('SERVER_QUEUE_SIZE', 32))
+
+# 종료 시 처리 중인 요청을 기다리는 최대 시간 (초)
+SERVER_SHUTDOWN_TIMEOUT = float(os.environ.get('SERVER_SHUTDOWN_TIMEOUT', 30))
+
+# 클라이언트 소켓 읽기/쓰기 제한 시간 (초) - 느린 연결이 워커를 오래 붙잡지 않도록
+SERVER_SOCKET_TIMEOUT = float(os.environ.get('SERVER_SOCKET_TIMEOUT', 30))
+
+HEALTH_PATH = '/healthz'
+
+logger = get_logger('local-server')
+
+
+def load_handlers(api_dir=API_DIR):
+    """
+    api 폴더의 핸들러 모듈을 불러와 경로별로 정리
+
+    Args:
+        api_dir (str): api 폴더 경로
+
+    Returns:
+        tuple: ({'/api/<이름>': handler 클래스}, {'<이름>': 모듈})
+    """
+    routes = {}
+    modules = {}
+
+    for file_name in sorted(os.listdir(api_dir)):
+        name, extension = os.path.splitext(file_name)
+        if extension != '.py':
+            continue
+
+        # 파일 이름에 '-'가 있어 import 문 대신 경로로 불러옴
+        module_name = 'api_' + name.replace('-', '_')
+        spec = importlib.util.spec_from_file_location(module_name, os.path.join(api_dir, file_name))
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[module_name] = module
+        spec.loader.exec_module(module)
+
+        handler_class = getattr(module, 'handler', None)
+        if handler_class is None:
+            continue
+
+        # 접근 로그는 서버가 구조화 로그로 남기므로 핸들러의 stderr 로그는 끔
+        routes[f'/api/{name}'] = type('handler', (_MountedHandler, handler_class), {})
+        modules[name] = module
+
+    return routes, modules
+
+
+class _MountedHandler:
+    """서버에 올린 핸들러 공통 동작 - 응답 상태 코드 기록, stderr 접근 로그 생략"""
+
+    def log_request(self, code='-', size='-'):
+        self.response_status = int(code) if isinstance(code, int) else None
+
+    def log_message(self, format, *args):
+        pass
+
+
+class ServerRequestHandler(_MountedHandler, JSONRequestHandler):
+    """
+    경로에 맞는 핸들러로 요청을 넘기는 라우터
+
+    요청 줄과 헤더를 읽은 뒤 같은 연결 상태를 가진 핸들러 객체를 만들어 do_<메소드>를 호출
+    """
+
+    logger = logger
+    allowed_methods = 'GET, POST, OPTIONS'
+    timeout = SERVER_SOCKET_TIMEOUT
+
+    def do_GET(self):
+        self._route()
+
+    def do_POST(self):
+        self._route()
+
+    def do_OPTIONS(self):
+        self._route()
+
+    def _route(self):
+        started = time.perf_counter()
+        self.response_status = None
+        path = urlsplit(self.path).path.rstrip('/') or '/'
+
+        if path == HEALTH_PATH:
+            health = self.server.health()
+            self.send_json(health, 200 if health['status'] == 'ok' else 503)
+            return
+
+        handler_class = self.server.routes.get(path)
+        method = getattr(handler_class, 'do_' + self.command, None)
+
+        if handler_class is None:
+            self.send_json({'status': 'error', 'message': f'경로를 찾을 수 없습니다: {path}'}, 404)
+        elif method is None:
+            self.send_json({'status': 'error', 'message': f'{self.command} 메소드를 지원하지 않습니다'}, 405)
+        else:
+            # 이미 읽은 요청 줄/헤더와 소켓을 그대로 넘김
+            delegate = handler_class.__new__(handler_class)
+            delegate.__dict__.update(self.__dict__)
+            try:
+                method(delegate)
+            finally:
+                self.close_connection = delegate.close_connection
+                self.response_status = getattr(delegate, 'response_status', None)
+
+        logger.info('request_done', method=self.command, path=path, status=self.response_status,
+                    duration_ms=round((time.perf_counter() - started) * 1000, 1))
+
+
+class PooledHTTPServer(HTTPServer):
+    """
+    고정 크기 워커 풀로 요청을 처리하는 HTTP 서버
+
+    워커 수 + 대기열 크기만큼만 연결을 받고, 넘치면 워커를 거치지 않고 503 응답
+    """
+
+    def __init__(self, server_address, routes, modules,
+                 workers=SERVER_WORKERS, queue_size=SERVER_QUEUE_SIZE):
+        super().__init__(server_address, ServerRequestHandler)
+        self.routes = routes
+        self.modules = modules
+        self.workers = workers
+        self.queue_size = queue_size
+        self.started_at = time.time()
+        self.draining = False
+
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='server-worker')
+        self._slots = threading.BoundedSemaphore(workers + queue_size)
+        self._in_flight = 0
+        self._in_flight_lock = threading.Lock()
+
+    def process_request(self, request, client_address):
+        if self.draining or not self._slots.acquire(blocking=False):
+            self._reject(request)
+            return
+        with self._in_flight_lock:
+            self._in_flight += 1
+        self._executor.submit(self._process_in_worker, request, client_address)
+
+    def _process_in_worker(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+            with self._in_flight_lock:
+                self._in_flight -= 1
+            self._slots.release()
+
+    def _reject(self, request):
+        """워커와 대기열이 모두 찬 경우 (또는 종료 중) 503 응답 후 연결 종료"""
+        body = dumps_json({'status': 'error', 'message': '서버가 요청을 처리할 수 없습니다. 잠시 후 다시 시도해주세요'})
+        try:
+            request.settimeout(1.0)
+            request.sendall(
+                b'HTTP/1.0 503 Service Unavailable\r\n'
+                b'Content-Type: application/json; charset=utf-8\r\n'
+                b'Retry-After: 1\r\n'
+                b'Connection: close\r\n'
+                + f'Content-Length: {len(body)}\r\n\r\n'.encode('ascii')
+                + body
+            )
+            # 이미 도착한 요청 본문을 읽어 두어야 close 시 RST로 응답이 유실되지 않음
+            request.setblocking(False)
+            request.recv(65536)
+        except OSError:
+            pass
+        finally:
+            self.shutdown_request(request)
+        logger.warning('request_rejected', draining=self.draining, in_flight=self._in_flight)
+
+    def handle_error(self, request, client_address):
+        exc_type, exc, _ = sys.exc_info()
+        logger.error('connection_failed', error_type=exc_type.__name__ if exc_type else '', error=str(exc))
+
+    def health(self):
+        """
+        서버 상태 (GET /healthz 응답)
+
+        Returns:
+            dict: 상태, 가동 시간, 처리 중 요청 수, 워커/대기열 크기, Sheets API 회로 상태, 지연 쓰기 대기 행 수
+        """
+        health = {
+            'status': 'draining' if self.draining else 'ok',
+            'uptime_seconds': round(time.time() - self.started_at, 1),
+            'in_flight': self._in_flight,
+            'workers': self.workers,
+            'queue_size': self.queue_size,
+            'routes': sorted(self.routes),
+            'sheets_api': sheets_breaker.status()
+        }
+        journal = getattr(self.modules.get('sheets-write'), '_journal', None)
+        if journal is not None:
+            health['write_journal_pending'] = journal.pending_count()
+        return health
+
+    def drain(self, timeout=SERVER_SHUTDOWN_TIMEOUT):
+        """
+        처리 중인 요청이 끝날 때까지 기다린 뒤 워커 풀과 지연 쓰기 플러셔 종료
+
+        Args:
+            timeout (float): 최대 대기 시간 (초)
+        """
+        self.draining = True
+        deadline = time.monotonic() + timeout
+        while self._in_flight and time.monotonic() < deadline:
+            time.sleep(0.05)
+        self._executor.shutdown(wait=False)
+
+        # 저널에 남은 행을 마지막으로 기록
+        flusher = getattr(self.modules.get('sheets-write'), '_flusher', None)
+        if flusher is not None:
+            flusher.stop(timeout=max(deadline - time.monotonic(), 1.0))
+
+        self.server_close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='api/*.py 핸들러를 하나의 상주 서버로 실행')
+    parser.add_argument('--host', default=os.environ.get('HOST', '0.0.0.0'))
+    parser.add_argument('--port', type=int, default=int(os.environ.get('PORT', 8000)))
+    parser.add_argument('--workers', type=int, default=SERVER_WORKERS)
+    parser.add_argument('--queue-size', type=int, default=SERVER_QUEUE_SIZE)
+    parser.add_argument('--warm-up', action='store_true', help='시작 전에 검색 캐시를 미리 준비')
+    args = parser.parse_args(argv)
+
+    routes, modules = load_handlers()
+
+    # 이전 프로세스가 남긴 지연 쓰기 대기 행을 바로 기록 (다음 write_behind 요청을 기다리지 않음)
+    if 'sheets-write' in modules:
+        modules['sheets-write'].resume_write_journal()
+
+    if args.warm_up:
+        warmup = modules['warmup']
+        timings = warmup.warm_up_all()
+        logger.info('warmup_done', **timings)
+
+    server = PooledHTTPServer((args.host, args.port), routes, modules,
+                              workers=args.workers, queue_size=args.queue_size)
+
+    def request_shutdown(signum, frame):
+        logger.info('shutdown_requested', signal=signal.Signals(signum).name)
+        server.draining = True
+        # serve_forever가 도는 스레드에서 shutdown()을 호출하면 멈추므로 별도 스레드에서 호출
+        threading.Thread(target=server.shutdown, name='server-shutdown', daemon=True).start()
+
+    signal.signal(signal.SIGTERM, request_shutdown)
+    signal.signal(signal.SIGINT, request_shutdown)
+
+    logger.info('server_started', host=args.host, port=server.server_address[1],
+                workers=args.workers, queue_size=args.queue_size, routes=sorted(routes))
+    try:
+        server.serve_forever()
+    finally:
+        server.drain()
+        logger.info('server_stopped')
+        flush_logs()
+
+
+if __name__ == '__main__':
+    main()